@@ -0,0 +1,2 @@
+from .process_pool import WarmProcessPool
+from .thread_pool import BoundedThreadPool, TaskRejected
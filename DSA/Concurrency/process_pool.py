@@ -0,0 +1,373 @@
+# process pool that stays warm between jobs
+# (BasicToAdvance/23_multiprocessing.py starts a new Process for every job)
+#
+#   if __name__ == '__main__':
+#       with WarmProcessPool(processes=8,preload=["json","DSA.Sorting"],recycle_after=10000) as pool:
+#           results=pool.map(work,items)          # items go over in batches of batch_size
+#           future=pool.submit(work,item)         # concurrent.futures.Future
+#
+# - workers are started once, with the preload modules already imported: with the
+#   forkserver start method the server imports them once and every worker is forked
+#   from it; otherwise every worker imports them when it starts
+# - a worker never runs more than recycle_after items, counted per item whatever the
+#   batch sizes (map chunks are capped at recycle_after, and a worker whose budget
+#   cannot take the next chunk retires a little early), so leaks cannot grow forever
+# - map / imap / starmap send batch_size items per round trip instead of one, and
+#   submit() calls that queue up while the workers are busy share a round trip too
+#
+# every worker has its own pipe and at most one batch in flight, so the pool always
+# knows which items a worker holds: the count for recycling is exact, and if a worker
+# dies only the futures of its batch fail (with BrokenProcessPool)
+import functools
+import importlib
+import itertools
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.connection import wait
+from multiprocessing.reduction import ForkingPickler
+
+READY="ready"
+
+def preloadModules(modules):
+    for name in modules:
+        importlib.import_module(name)
+
+def runTask(fn,items,star):
+    # (ok, values, error): values holds the results computed before an error
+    values=[]
+    try:
+        for args in items:
+            values.append(fn(*args) if star else fn(args))
+    except Exception as e:
+        return False,values,e
+    return True,values,None
+
+def workerMain(conn,preload):
+    # runs in the worker process: one batch in, one list of task results out
+    try:
+        preloadModules(preload)
+    except Exception as e:
+        conn.send(e)
+        return
+    try:
+        conn.send(READY)
+        while True:
+            batch=conn.recv()
+            if batch is None:
+                return
+            results=[runTask(*task) for task in batch]
+            try:
+                conn.send(results)
+            except (OSError,EOFError):
+                raise
+            except Exception as e:
+                # a result or exception that cannot be pickled; pickling fails before
+                # anything is written, so the pipe is still usable
+                error=RuntimeError(f"result could not be sent back: {e!r}")
+                conn.send([(False,[],error)]*len(results))
+    except (OSError,EOFError):
+        # the pool closed our pipe (shutdown or terminate)
+        return
+
+def defaultStartMethod():
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+class Task:
+    # items for one fn; single=True for submit(), whose future gets the one value
+    __slots__=("fn","items","star","future","single")
+
+    def __init__(self,fn,items,star,single=False):
+        self.fn=fn
+        self.items=items
+        self.star=star
+        self.future=Future()
+        self.single=single
+
+    def finish(self,ok,values,error):
+        if not ok:
+            self.future.set_exception(error)
+        elif self.single:
+            self.future.set_result(values[0])
+        else:
+            self.future.set_result(values)
+
+class Worker:
+    # parent side of one worker process
+    def __init__(self,ctx,preload):
+        self.conn,child=ctx.Pipe()
+        self.process=ctx.Process(target=workerMain,args=(child,preload),daemon=True)
+        self.process.start()
+        # without our copy of the child end, a dead worker shows up as EOF
+        child.close()
+        self.ready=False
+        self.items=0       # items sent to this worker so far
+        self.batch=None    # tasks in flight, None while idle
+        self.successor=None
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.conn.close()
+
+class WarmProcessPool:
+    def __init__(self,processes=None,preload=(),recycle_after=10000,batch_size=64,start_method=None):
+        self.processes=processes or os.cpu_count() or 1
+        if recycle_after is not None and recycle_after<1:
+            raise ValueError("recycle_after must be at least 1 (or None)")
+        self.batch_size=max(1,batch_size)
+        self.recycle_after=recycle_after
+        self.preload=list(preload)
+        self.start_method=start_method or defaultStartMethod()
+        self.ctx=multiprocessing.get_context(self.start_method)
+        if self.start_method=="forkserver" and self.preload:
+            # must happen before the fork server starts, i.e. before the first forkserver process
+            self.ctx.set_forkserver_preload(self.preload)
+        self.pending=deque()
+        self.retired=[]
+        self.closing=False
+        self.terminated=False
+        self.lock=threading.Lock()
+        self.woken=False
+        self.wakeReader,self.wakeWriter=self.ctx.Pipe(duplex=False)
+        self.workers=[Worker(self.ctx,self.preload) for _ in range(self.processes)]
+        self.warmUp()
+        self.manager=threading.Thread(target=self.run,name="WarmProcessPool",daemon=True)
+        self.manager.start()
+
+    def warmUp(self):
+        # wait until every worker has imported the preload modules, so the first
+        # real job does not pay for startup
+        for w in self.workers:
+            try:
+                msg=w.conn.recv()
+            except EOFError:
+                msg=BrokenProcessPool(f"worker {w.process.pid} exited during startup")
+            if msg!=READY:
+                for other in self.workers:
+                    other.process.terminate()
+                raise msg
+            w.ready=True
+
+    # ---------- manager thread ----------
+
+    def run(self):
+        while True:
+            self.dispatch()
+            if self.closing and not self.pending and all(w.batch is None for w in self.workers):
+                break
+            conns={w.conn:w for w in self.workers}
+            for conn in wait(list(conns)+[self.wakeReader]):
+                if conn is self.wakeReader:
+                    while self.wakeReader.poll():
+                        self.wakeReader.recv_bytes()
+                    with self.lock:
+                        self.woken=False
+                else:
+                    self.receive(conns[conn])
+        spare=[w.successor for w in self.workers if w.successor is not None]
+        if not self.terminated:
+            for w in self.workers+spare:
+                w.stop()
+        for w in self.workers+self.retired+spare:
+            w.process.join()
+        self.wakeReader.close()
+        self.wakeWriter.close()
+
+    def dispatch(self):
+        for w in self.workers:
+            if not self.pending:
+                return
+            if not w.ready or w.batch is not None:
+                continue
+            # fill up to batch_size items, but not past the worker's recycle count
+            room=self.batch_size
+            if self.recycle_after is not None:
+                room=min(room,self.recycle_after-w.items)
+                if w.items and len(self.pending[0].items)>room:
+                    # the next task does not fit in what is left of this worker's
+                    # budget: retire it a little early instead of running past it
+                    # (chunks() keeps every task within recycle_after items)
+                    self.replace(w)
+                    continue
+            batch=[]
+            n=0
+            while self.pending and (not batch or n+len(self.pending[0].items)<=room):
+                task=self.pending.popleft()
+                if task.future.set_running_or_notify_cancel():
+                    batch.append(task)
+                    n+=len(task.items)
+            if batch:
+                self.send(w,batch,n)
+
+    def send(self,w,batch,n):
+        message=[(t.fn,t.items,t.star) for t in batch]
+        try:
+            data=ForkingPickler.dumps(message)
+        except Exception:
+            # find the tasks that cannot be pickled (a lambda...) and fail only those
+            good=[]
+            for t in batch:
+                try:
+                    ForkingPickler.dumps((t.fn,t.items,t.star))
+                except Exception as e:
+                    t.future.set_exception(e)
+                    n-=len(t.items)
+                else:
+                    good.append(t)
+            if not good:
+                return
+            batch=good
+            data=ForkingPickler.dumps([(t.fn,t.items,t.star) for t in batch])
+        w.conn.send_bytes(data)
+        w.batch=batch
+        w.items+=n
+        if self.recycle_after is not None and 2*w.items>=self.recycle_after and w.successor is None:
+            # halfway through its items: start the replacement now so it is warm
+            # (preloaded and past startup) by the time this worker retires
+            w.successor=Worker(self.ctx,self.preload)
+
+    def receive(self,w):
+        try:
+            msg=w.conn.recv()
+        except (EOFError,OSError):
+            self.lost(w)
+            return
+        if not w.ready:
+            if msg!=READY:
+                # a replacement could not import the preload modules
+                self.lost(w,respawn=False)
+                return
+            w.ready=True
+            return
+        batch,w.batch=w.batch,None
+        for task,result in zip(batch,msg):
+            task.finish(*result)
+        if self.recycle_after is not None and w.items>=self.recycle_after and not self.closing:
+            self.replace(w)
+
+    def replace(self,w):
+        w.stop()
+        self.retired=[r for r in self.retired if r.process.is_alive()]
+        self.retired.append(w)
+        self.workers[self.workers.index(w)]=w.successor or Worker(self.ctx,self.preload)
+
+    def lost(self,w,respawn=True):
+        w.process.join()
+        code=w.process.exitcode
+        w.conn.close()
+        if w.successor is not None:
+            w.successor.stop()
+            self.retired.append(w.successor)
+        if w.batch:
+            error=BrokenProcessPool(f"worker {w.process.pid} exited with code {code}")
+            for task in w.batch:
+                task.future.set_exception(error)
+        self.workers.remove(w)
+        if respawn and not self.terminated:
+            self.workers.append(Worker(self.ctx,self.preload))
+        elif not self.workers:
+            self.failPending(BrokenProcessPool("no worker process left"))
+
+    def takePending(self):
+        # empties the queue; safe while the manager thread is popping from it too
+        tasks=[]
+        while True:
+            try:
+                tasks.append(self.pending.popleft())
+            except IndexError:
+                return tasks
+
+    def failPending(self,error):
+        for task in self.takePending():
+            if task.future.set_running_or_notify_cancel():
+                task.future.set_exception(error)
+
+    # ---------- public API ----------
+
+    def wake(self):
+        with self.lock:
+            if self.woken:
+                return
+            self.woken=True
+            self.wakeWriter.send_bytes(b"")
+
+    def schedule(self,tasks):
+        if self.closing:
+            raise RuntimeError("cannot schedule new tasks after shutdown")
+        self.pending.extend(tasks)
+        self.wake()
+        return tasks
+
+    def submit(self,fn,*args,**kwargs):
+        if kwargs:
+            fn=functools.partial(fn,**kwargs)
+        return self.schedule([Task(fn,[args],True,single=True)])[0].future
+
+    def chunks(self,fn,iterable,batch_size,star):
+        size=batch_size or self.batch_size
+        if self.recycle_after is not None:
+            # a fresh worker must be able to take a whole chunk
+            size=min(size,self.recycle_after)
+        iterator=iter(iterable)
+        tasks=[]
+        while True:
+            items=list(itertools.islice(iterator,size))
+            if not items:
+                return self.schedule(tasks)
+            tasks.append(Task(fn,items,star))
+
+    def imap(self,fn,iterable,batch_size=None,ordered=True,star=False):
+        # the input is split into batches and queued right away; the returned
+        # iterator yields the results as they arrive
+        futures=[t.future for t in self.chunks(fn,iterable,batch_size,star)]
+        if not ordered:
+            futures=as_completed(futures)
+        return (value for future in futures for value in future.result())
+
+    def map(self,fn,iterable,batch_size=None):
+        return list(self.imap(fn,iterable,batch_size))
+
+    def starmap(self,fn,iterable,batch_size=None):
+        return list(self.imap(fn,iterable,batch_size,star=True))
+
+    def shutdown(self,wait=True,cancel_futures=False):
+        # finishes queued work unless cancel_futures, then stops the workers
+        self.closing=True
+        if cancel_futures:
+            for task in self.takePending():
+                task.future.cancel()
+        self.wake()
+        if wait:
+            self.manager.join()
+
+    def terminate(self):
+        # kills the workers; queued and running tasks fail with BrokenProcessPool
+        self.closing=True
+        self.terminated=True
+        self.failPending(BrokenProcessPool("pool terminated"))
+        for w in list(self.workers):
+            w.process.terminate()
+            if w.successor is not None:
+                w.successor.process.terminate()
+        self.wake()
+        self.manager.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc):
+        if exc[0] is None:
+            self.shutdown()
+        else:
+            self.terminate()
+        return False
+
+# 100000 tiny tasks on 1 worker, no recycling: batch_size=1 ~2.2s, batch_size=256 ~0.09s
+# a replacement worker needs ~40ms to start; it is started when the old one is
+# halfway through its items, so only very cheap items make recycling show up
@@ -0,0 +1,225 @@
+# fixed set of worker threads fed from a bounded queue
+# (BasicToAdvance/22_multitreading.py starts and joins one Thread per task)
+#
+#   with BoundedThreadPool(workers=8,queue_size=1000,on_full="block") as pool:
+#       future=pool.submit(download,url,timeout=5)
+#       print(future.result())
+#       print(pool.metrics())
+#
+# on_full="block"  -> submit() waits until the queue has room (backpressure)
+# on_full="reject" -> submit() raises TaskRejected right away
+# timeout          -> the future fails with TimeoutError if the task has not finished
+#                     that many seconds after submit(); a task still queued by then is
+#                     skipped, a running one finishes in the background (threads cannot
+#                     be killed) and its result is dropped
+import heapq
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+
+class TaskRejected(Exception):
+    pass
+
+STOP=object()
+
+class Task:
+    __slots__=("future","fn","args","kwargs","submitted","deadline")
+
+    def __init__(self,future,fn,args,kwargs,deadline):
+        self.future=future
+        self.fn=fn
+        self.args=args
+        self.kwargs=kwargs
+        self.submitted=time.monotonic()
+        self.deadline=deadline
+
+class Watchdog(threading.Thread):
+    # one thread for all timeouts: a heap of [deadline, n, future] entries
+    def __init__(self):
+        super().__init__(name="BoundedThreadPool-watchdog",daemon=True)
+        self.heap=[]
+        self.counter=itertools.count()
+        self.cond=threading.Condition()
+        self.stopped=False
+        self.stale=0    # entries whose future finished before its deadline
+
+    def watch(self,deadline,future):
+        entry=[deadline,next(self.counter),future]
+        with self.cond:
+            heapq.heappush(self.heap,entry)
+            self.cond.notify()
+        future.add_done_callback(lambda _: self.forget(entry))
+
+    def forget(self,entry):
+        # the future is done: drop our reference now instead of at the deadline,
+        # and rebuild the heap once more than half of it is stale
+        with self.cond:
+            if entry[2] is None:
+                return
+            entry[2]=None
+            self.stale+=1
+            if 2*self.stale>len(self.heap):
+                self.heap=[e for e in self.heap if e[2] is not None]
+                heapq.heapify(self.heap)
+                self.stale=0
+
+    def stop(self):
+        with self.cond:
+            self.stopped=True
+            self.cond.notify()
+
+    def run(self):
+        with self.cond:
+            while not self.stopped:
+                if not self.heap:
+                    self.cond.wait()
+                    continue
+                entry=self.heap[0]
+                if entry[2] is None:
+                    heapq.heappop(self.heap)
+                    self.stale-=1
+                    continue
+                wait=entry[0]-time.monotonic()
+                if wait>0:
+                    self.cond.wait(wait)
+                    continue
+                heapq.heappop(self.heap)
+                future,entry[2]=entry[2],None
+                try:
+                    future.set_exception(TimeoutError("task timed out"))
+                except InvalidStateError:
+                    pass
+
+class BoundedThreadPool:
+    def __init__(self,workers=4,queue_size=100,on_full="block",default_timeout=None,name="BoundedThreadPool"):
+        if on_full not in ("block","reject"):
+            raise ValueError("on_full must be 'block' or 'reject'")
+        self.on_full=on_full
+        self.default_timeout=default_timeout
+        self.queue=queue.Queue(maxsize=queue_size)
+        self.lock=threading.Lock()
+        # held around the closed check + enqueue in submit() and by shutdown() while it
+        # closes the pool, so no task can land behind the STOP sentinels; separate from
+        # self.lock because a blocking put waits for workers that need self.lock
+        self.submitLock=threading.Lock()
+        self.closed=False
+        self.stats={"submitted":0,"completed":0,"failed":0,"rejected":0,"timed_out":0,"cancelled":0,
+                    "max_queue_depth":0,"wait_time_total":0.0,"wait_time_max":0.0,"run_time_total":0.0}
+        self.watchdog=Watchdog()
+        self.watchdog.start()
+        self.threads=[threading.Thread(target=self.worker,name=f"{name}-{i}",daemon=True) for i in range(workers)]
+        for t in self.threads:
+            t.start()
+
+    def submit(self,fn,*args,timeout=None,**kwargs):
+        timeout=self.default_timeout if timeout is None else timeout
+        future=Future()
+        deadline=None if timeout is None else time.monotonic()+timeout
+        task=Task(future,fn,args,kwargs,deadline)
+        try:
+            with self.submitLock:
+                if self.closed:
+                    raise RuntimeError("cannot submit after shutdown")
+                if self.on_full=="block":
+                    self.queue.put(task)
+                else:
+                    self.queue.put_nowait(task)
+        except queue.Full:
+            with self.lock:
+                self.stats["rejected"]+=1
+            raise TaskRejected(f"queue is full ({self.queue.maxsize} tasks waiting)") from None
+        with self.lock:
+            self.stats["submitted"]+=1
+            depth=self.queue.qsize()
+            if depth>self.stats["max_queue_depth"]:
+                self.stats["max_queue_depth"]=depth
+        if deadline is not None:
+            self.watchdog.watch(deadline,future)
+        return future
+
+    def worker(self):
+        while True:
+            task=self.queue.get()
+            if task is STOP:
+                return
+            waited=time.monotonic()-task.submitted
+            with self.lock:
+                self.stats["wait_time_total"]+=waited
+                if waited>self.stats["wait_time_max"]:
+                    self.stats["wait_time_max"]=waited
+            future=task.future
+            if task.deadline is not None and time.monotonic()>=task.deadline:
+                self.finish(future,"timed_out",exception=TimeoutError("task timed out in the queue"))
+                continue
+            # the watchdog can fail the future at any moment up to here, and
+            # set_running_or_notify_cancel() raises on a finished future
+            try:
+                running=not future.done() and future.set_running_or_notify_cancel()
+            except RuntimeError:
+                running=False
+            if not running:
+                with self.lock:
+                    self.stats["cancelled" if future.cancelled() else "timed_out"]+=1
+                continue
+            start=time.monotonic()
+            try:
+                result=task.fn(*task.args,**task.kwargs)
+            except BaseException as error:
+                self.finish(future,"failed",exception=error,run=time.monotonic()-start)
+            else:
+                self.finish(future,"completed",result=result,run=time.monotonic()-start)
+
+    def finish(self,future,outcome,result=None,exception=None,run=0.0):
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            # the watchdog already failed it with TimeoutError
+            outcome="timed_out"
+        with self.lock:
+            self.stats[outcome]+=1
+            self.stats["run_time_total"]+=run
+
+    def metrics(self):
+        with self.lock:
+            m=dict(self.stats)
+        started=m["completed"]+m["failed"]+m["timed_out"]+m["cancelled"]
+        m["queue_depth"]=self.queue.qsize()
+        m["wait_time_avg"]=m["wait_time_total"]/started if started else 0.0
+        return m
+
+    def shutdown(self,wait=True,drain=True):
+        # drain=True runs everything already queued, drain=False cancels it
+        with self.submitLock:
+            if self.closed:
+                return
+            self.closed=True
+            if not drain:
+                while True:
+                    try:
+                        task=self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if task is not STOP and task.future.cancel():
+                        with self.lock:
+                            self.stats["cancelled"]+=1
+            for _ in self.threads:
+                self.queue.put(STOP)
+        if wait:
+            for t in self.threads:
+                t.join()
+        self.watchdog.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc):
+        self.shutdown(wait=True,drain=True)
+        return False
+
+# submit: O(log t) with t pending timeouts (finished tasks leave the heap early,
+# amortised O(1)), workers never exit between tasks
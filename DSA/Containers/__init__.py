@@ -0,0 +1,3 @@
+from .implicit_treap import TreapSequence
+from .sorted_dict import SortedDict
+from .sorted_list import SortedList
@@ -0,0 +1,267 @@
+# sequence with O(log n) range reversal (ArrayReverse in BasicToAdvance/5_ArrayReverseRecursion.py
+# is O(n) per call), backed by an implicit treap
+#
+# the treap is a binary tree ordered by position (the in-order walk is the sequence)
+# and heap ordered by random priorities, which keeps it O(log n) deep on average.
+# A node does not store its index, only the size of its subtree; reverse(l, r) cuts
+# out the nodes for [l, r), flips a lazy "reversed" flag on the root of that piece
+# and glues it back. The flag is only pushed down to the children when a later
+# operation walks through the node.
+#
+# nodes live in parallel lists inside a NodePool (index 0 is the empty tree), which
+# is much lighter than one Python object per node
+import random
+
+class NodePool:
+    def __init__(self):
+        self.value=[None]
+        self.priority=[0]
+        self.left=[0]
+        self.right=[0]
+        self.size=[0]
+        self.flipped=bytearray(1)
+        self.free=[]
+        self.rng=random.Random()
+
+    def new(self,value):
+        if self.free:
+            t=self.free.pop()
+            self.value[t]=value
+            self.priority[t]=self.rng.random()
+            self.left[t]=self.right[t]=0
+            self.size[t]=1
+            self.flipped[t]=0
+            return t
+        self.value.append(value)
+        self.priority.append(self.rng.random())
+        self.left.append(0)
+        self.right.append(0)
+        self.size.append(1)
+        self.flipped.append(0)
+        return len(self.value)-1
+
+    def push(self,t):
+        # hand a pending reversal down to the children (flipping node 0, the
+        # empty tree, is harmless because nothing ever reads it)
+        if self.flipped[t]:
+            l,r=self.left[t],self.right[t]
+            self.left[t],self.right[t]=r,l
+            self.flipped[l]^=1
+            self.flipped[r]^=1
+            self.flipped[t]=0
+
+    def update(self,t):
+        self.size[t]=self.size[self.left[t]]+self.size[self.right[t]]+1
+
+    def split(self,t,k):
+        # (first k items, the rest); walks down once, hanging every node it passes
+        # on the right spine of the first part or the left spine of the second
+        left,right,size,flipped=self.left,self.right,self.size,self.flipped
+        aRoot=bRoot=aLast=bLast=0
+        path=[]
+        while t:
+            if flipped[t]:
+                # push() inlined, this loop is the hot path of reverse()
+                l,r=left[t],right[t]
+                left[t],right[t]=r,l
+                flipped[l]^=1
+                flipped[r]^=1
+                flipped[t]=0
+            path.append(t)
+            before=size[left[t]]
+            if before>=k:
+                if bLast:
+                    left[bLast]=t
+                else:
+                    bRoot=t
+                bLast=t
+                t=left[t]
+            else:
+                if aLast:
+                    right[aLast]=t
+                else:
+                    aRoot=t
+                aLast=t
+                k-=before+1
+                t=right[t]
+        if aLast:
+            right[aLast]=0
+        if bLast:
+            left[bLast]=0
+        for t in reversed(path):
+            size[t]=size[left[t]]+size[right[t]]+1
+        return aRoot,bRoot
+
+    def merge(self,a,b):
+        # all items of a followed by all items of b; walks down the right spine
+        # of a and the left spine of b, the higher priority node goes on top
+        left,right,size,priority,flipped=self.left,self.right,self.size,self.priority,self.flipped
+        root=parent=0
+        toRight=False
+        path=[]
+        while a and b:
+            if priority[a]>priority[b]:
+                t=a
+                if flipped[t]:
+                    l,r=left[t],right[t]
+                    left[t],right[t]=r,l
+                    flipped[l]^=1
+                    flipped[r]^=1
+                    flipped[t]=0
+                a=right[t]
+                nextRight=True
+            else:
+                t=b
+                if flipped[t]:
+                    l,r=left[t],right[t]
+                    left[t],right[t]=r,l
+                    flipped[l]^=1
+                    flipped[r]^=1
+                    flipped[t]=0
+                b=left[t]
+                nextRight=False
+            if not parent:
+                root=t
+            elif toRight:
+                right[parent]=t
+            else:
+                left[parent]=t
+            path.append(t)
+            parent,toRight=t,nextRight
+        rest=a or b
+        if not parent:
+            return rest
+        if toRight:
+            right[parent]=rest
+        else:
+            left[parent]=rest
+        for t in reversed(path):
+            size[t]=size[left[t]]+size[right[t]]+1
+        return root
+
+    def build(self,values):
+        # Cartesian tree over random priorities in O(n) with a stack
+        stack=[]
+        for v in values:
+            t=self.new(v)
+            last=0
+            while stack and self.priority[stack[-1]]<self.priority[t]:
+                last=stack.pop()
+                self.update(last)
+            self.left[t]=last
+            if stack:
+                self.right[stack[-1]]=t
+            stack.append(t)
+        while len(stack)>1:
+            self.update(stack.pop())
+        if not stack:
+            return 0
+        self.update(stack[0])
+        return stack[0]
+
+class TreapSequence:
+    def __init__(self,iterable=(),pool=None,root=None):
+        self._pool=pool or NodePool()
+        self._root=self._pool.build(iterable) if root is None else root
+
+    def __len__(self):
+        return self._pool.size[self._root]
+
+    def _normalize(self,index):
+        n=len(self)
+        if index<0:
+            index+=n
+        if not 0<=index<n:
+            raise IndexError("TreapSequence index out of range")
+        return index
+
+    def _node(self,index):
+        pool=self._pool
+        t=self._root
+        while True:
+            pool.push(t)
+            left=pool.size[pool.left[t]]
+            if index<left:
+                t=pool.left[t]
+            elif index==left:
+                return t
+            else:
+                index-=left+1
+                t=pool.right[t]
+
+    def __getitem__(self,index):
+        if isinstance(index,slice):
+            return self.tolist()[index]
+        return self._pool.value[self._node(self._normalize(index))]
+
+    def __setitem__(self,index,value):
+        self._pool.value[self._node(self._normalize(index))]=value
+
+    def reverse(self,l=0,r=None):
+        # reverse the items at positions [l, r) in place (slice style bounds)
+        n=len(self)
+        l,r,_=slice(l,r).indices(n)
+        if r-l<2:
+            return
+        pool=self._pool
+        a,b=pool.split(self._root,l)
+        b,c=pool.split(b,r-l)
+        pool.flipped[b]^=1
+        self._root=pool.merge(pool.merge(a,b),c)
+
+    def insert(self,index,value):
+        index=max(0,min(len(self),index+len(self) if index<0 else index))
+        pool=self._pool
+        a,b=pool.split(self._root,index)
+        self._root=pool.merge(pool.merge(a,pool.new(value)),b)
+
+    def append(self,value):
+        self._root=self._pool.merge(self._root,self._pool.new(value))
+
+    def pop(self,index=-1):
+        index=self._normalize(index)
+        pool=self._pool
+        a,b=pool.split(self._root,index)
+        t,c=pool.split(b,1)
+        self._root=pool.merge(a,c)
+        pool.free.append(t)
+        return pool.value[t]
+
+    def split(self,k):
+        # keeps the first k items, returns the rest as a new sequence (same node pool)
+        a,b=self._pool.split(self._root,max(0,min(k,len(self))))
+        self._root=a
+        return TreapSequence(pool=self._pool,root=b)
+
+    def concat(self,other):
+        # moves all items of other to the end of this sequence; other ends up empty
+        if other is self:
+            raise ValueError("cannot concat a sequence with itself")
+        if other._pool is self._pool:
+            self._root=self._pool.merge(self._root,other._root)
+        else:
+            self._root=self._pool.merge(self._root,self._pool.build(other))
+        other._root=0
+        return self
+
+    def __iter__(self):
+        # in-order walk with an explicit stack, pushing pending reversals on the way
+        pool=self._pool
+        stack=[]
+        t=self._root
+        while stack or t:
+            while t:
+                pool.push(t)
+                stack.append(t)
+                t=pool.left[t]
+            t=stack.pop()
+            yield pool.value[t]
+            t=pool.right[t]
+
+    def tolist(self):
+        return list(self)
+
+    def __repr__(self):
+        return f"TreapSequence({self.tolist()!r})"
+
+# reverse / insert / pop / split / concat / indexing: O(log n) expected, tolist: O(n)
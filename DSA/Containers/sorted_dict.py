@@ -0,0 +1,100 @@
+# dict whose keys are kept in sorted order by a SortedList next to a plain dict
+from .sorted_list import SortedList
+
+class SortedDict:
+    def __init__(self,*args,**kwargs):
+        self._dict={}
+        self._keys=SortedList()
+        self.update(*args,**kwargs)
+
+    def __setitem__(self,key,value):
+        if key not in self._dict:
+            self._keys.add(key)
+        self._dict[key]=value
+
+    def __getitem__(self,key):
+        return self._dict[key]
+
+    def __delitem__(self,key):
+        del self._dict[key]
+        self._keys.remove(key)
+
+    def __contains__(self,key):
+        return key in self._dict
+
+    def __len__(self):
+        return len(self._dict)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __reversed__(self):
+        return reversed(self._keys)
+
+    def __eq__(self,other):
+        if isinstance(other,SortedDict):
+            return self._dict==other._dict
+        return self._dict==other
+
+    def __repr__(self):
+        items=", ".join(f"{k!r}: {v!r}" for k,v in self.items())
+        return f"SortedDict({{{items}}})"
+
+    def update(self,*args,**kwargs):
+        new=dict(*args,**kwargs)
+        self._keys.update(k for k in new if k not in self._dict)
+        self._dict.update(new)
+
+    def get(self,key,default=None):
+        return self._dict.get(key,default)
+
+    def setdefault(self,key,default=None):
+        if key not in self._dict:
+            self[key]=default
+        return self._dict[key]
+
+    def pop(self,key,*default):
+        if key in self._dict:
+            self._keys.remove(key)
+        return self._dict.pop(key,*default)
+
+    def popitem(self,index=-1):
+        # removes and returns the (key, value) at the sorted position index
+        if not self._dict:
+            raise KeyError("popitem(): dictionary is empty")
+        key=self._keys.pop(index)
+        return key,self._dict.pop(key)
+
+    def peekitem(self,index=-1):
+        key=self._keys[index]
+        return key,self._dict[key]
+
+    def clear(self):
+        self._dict.clear()
+        self._keys.clear()
+
+    def keys(self):
+        return iter(self._keys)
+
+    def values(self):
+        return (self._dict[k] for k in self._keys)
+
+    def items(self):
+        return ((k,self._dict[k]) for k in self._keys)
+
+    def index(self,key):
+        return self._keys.index(key)
+
+    def rank(self,key):
+        return self._keys.rank(key)
+
+    def bisect_left(self,key):
+        return self._keys.bisect_left(key)
+
+    def bisect_right(self,key):
+        return self._keys.bisect_right(key)
+
+    def irange(self,minimum=None,maximum=None,inclusive=(True,True),reverse=False):
+        return self._keys.irange(minimum,maximum,inclusive,reverse)
+
+# get / set / delete: TC=O(log n), iteration in key order: O(n)
@@ -0,0 +1,275 @@
+# sorted list kept as a list of small sorted chunks (list-of-lists)
+#
+# _lists  -> the chunks, each at most 2*LOAD items, together in sorted order
+# _maxes  -> last item of every chunk, bisect on it finds the right chunk
+# _index  -> Fenwick tree over the chunk lengths, turns a position into
+#            (chunk, offset) and back in O(log m) for m chunks
+#
+# chunks stay short so inserting into one is a small memmove, and the
+# whole structure is plain Python lists that are read front to back
+from bisect import bisect_left, bisect_right, insort
+
+LOAD=1000
+
+class SortedList:
+    def __init__(self,iterable=()):
+        self._lists=[]
+        self._maxes=[]
+        self._index=[]
+        self._len=0
+        self.update(iterable)
+
+    # ---------- chunk bookkeeping ----------
+
+    def _rebuild(self,values):
+        # values must already be sorted
+        self._lists=[values[i:i+LOAD] for i in range(0,len(values),LOAD)]
+        self._maxes=[chunk[-1] for chunk in self._lists]
+        self._len=len(values)
+        self._buildIndex()
+
+    def _buildIndex(self):
+        tree=[len(chunk) for chunk in self._lists]
+        for i in range(len(tree)):
+            j=i|(i+1)
+            if j<len(tree):
+                tree[j]+=tree[i]
+        self._index=tree
+
+    def _indexAdd(self,i,delta):
+        tree=self._index
+        while i<len(tree):
+            tree[i]+=delta
+            i|=i+1
+
+    def _prefix(self,i):
+        # number of items in chunks [0, i)
+        tree=self._index
+        total=0
+        while i>0:
+            total+=tree[i-1]
+            i&=i-1
+        return total
+
+    def _locate(self,index):
+        # position -> (chunk, offset), index must be in range
+        tree=self._index
+        pos=0
+        step=1<<(len(tree).bit_length()-1) if tree else 0
+        while step:
+            nxt=pos+step
+            if nxt<=len(tree) and tree[nxt-1]<=index:
+                index-=tree[nxt-1]
+                pos=nxt
+            step>>=1
+        return pos,index
+
+    def _delete(self,i,j):
+        chunk=self._lists[i]
+        del chunk[j]
+        self._len-=1
+        if not chunk:
+            del self._lists[i]
+            del self._maxes[i]
+            self._buildIndex()
+            return
+        self._maxes[i]=chunk[-1]
+        if len(chunk)<LOAD//2 and len(self._lists)>1:
+            # fold a small chunk into its neighbour, split again if that got too big
+            if i==len(self._lists)-1:
+                i-=1
+            merged=self._lists[i]+self._lists[i+1]
+            if len(merged)>2*LOAD:
+                half=len(merged)//2
+                self._lists[i:i+2]=[merged[:half],merged[half:]]
+                self._maxes[i:i+2]=[merged[half-1],merged[-1]]
+            else:
+                self._lists[i:i+2]=[merged]
+                self._maxes[i:i+2]=[merged[-1]]
+            self._buildIndex()
+        else:
+            self._indexAdd(i,-1)
+
+    # ---------- updates ----------
+
+    def add(self,value):
+        lists=self._lists
+        if not lists:
+            self._lists=[[value]]
+            self._maxes=[value]
+            self._index=[1]
+            self._len=1
+            return
+        i=bisect_right(self._maxes,value)
+        if i==len(lists):
+            i-=1
+            lists[i].append(value)
+            self._maxes[i]=value
+        else:
+            insort(lists[i],value)
+        self._len+=1
+        if len(lists[i])>2*LOAD:
+            chunk=lists[i]
+            lists[i:i+1]=[chunk[:LOAD],chunk[LOAD:]]
+            self._maxes[i:i+1]=[chunk[LOAD-1],chunk[-1]]
+            self._buildIndex()
+        else:
+            self._indexAdd(i,1)
+
+    def update(self,iterable):
+        values=sorted(iterable)
+        if not values:
+            return
+        if len(values)*8<self._len:
+            for value in values:
+                self.add(value)
+        else:
+            # big batch: one merge of two sorted lists is cheaper than many inserts
+            self._rebuild(sorted(list(self)+values) if self._len else values)
+
+    def remove(self,value):
+        i=bisect_left(self._maxes,value)
+        if i<len(self._maxes):
+            j=bisect_left(self._lists[i],value)
+            if self._lists[i][j]==value:
+                self._delete(i,j)
+                return
+        raise ValueError(f"{value!r} not in list")
+
+    def discard(self,value):
+        try:
+            self.remove(value)
+        except ValueError:
+            pass
+
+    def pop(self,index=-1):
+        i,j=self._locate(self._normalize(index))
+        value=self._lists[i][j]
+        self._delete(i,j)
+        return value
+
+    def clear(self):
+        self._rebuild([])
+
+    # ---------- queries ----------
+
+    def bisect_left(self,value):
+        i=bisect_left(self._maxes,value)
+        if i==len(self._maxes):
+            return self._len
+        return self._prefix(i)+bisect_left(self._lists[i],value)
+
+    def bisect_right(self,value):
+        i=bisect_right(self._maxes,value)
+        if i==len(self._maxes):
+            return self._len
+        return self._prefix(i)+bisect_right(self._lists[i],value)
+
+    bisect=bisect_right
+
+    def rank(self,value):
+        # number of items smaller than value
+        return self.bisect_left(value)
+
+    def count(self,value):
+        return self.bisect_right(value)-self.bisect_left(value)
+
+    def index(self,value):
+        pos=self.bisect_left(value)
+        if pos==self._len or self[pos]!=value:
+            raise ValueError(f"{value!r} not in list")
+        return pos
+
+    def islice(self,start=None,stop=None,reverse=False):
+        # items at positions [start, stop) without building a list
+        start,stop,_=slice(start,stop).indices(self._len)
+        if start>=stop:
+            return
+        lists=self._lists
+        if reverse:
+            i,j=self._locate(stop-1)
+            remaining=stop-start
+            while remaining:
+                chunk=lists[i]
+                take=min(j+1,remaining)
+                yield from reversed(chunk[j+1-take:j+1])
+                remaining-=take
+                i-=1
+                j=len(lists[i])-1 if i>=0 else 0
+        else:
+            i,j=self._locate(start)
+            remaining=stop-start
+            while remaining:
+                chunk=lists[i]
+                take=min(len(chunk)-j,remaining)
+                yield from chunk[j:j+take]
+                remaining-=take
+                i+=1
+                j=0
+
+    def irange(self,minimum=None,maximum=None,inclusive=(True,True),reverse=False):
+        # items between minimum and maximum in sorted order, None means unbounded
+        if minimum is None:
+            start=0
+        else:
+            start=self.bisect_left(minimum) if inclusive[0] else self.bisect_right(minimum)
+        if maximum is None:
+            stop=self._len
+        else:
+            stop=self.bisect_right(maximum) if inclusive[1] else self.bisect_left(maximum)
+        return self.islice(start,stop,reverse)
+
+    # ---------- sequence protocol ----------
+
+    def _normalize(self,index):
+        if index<0:
+            index+=self._len
+        if not 0<=index<self._len:
+            raise IndexError("SortedList index out of range")
+        return index
+
+    def __getitem__(self,index):
+        if isinstance(index,slice):
+            start,stop,step=index.indices(self._len)
+            if step==1:
+                return list(self.islice(start,stop))
+            return [self[i] for i in range(start,stop,step)]
+        i,j=self._locate(self._normalize(index))
+        return self._lists[i][j]
+
+    def __delitem__(self,index):
+        if isinstance(index,slice):
+            for i in sorted(range(*index.indices(self._len)),reverse=True):
+                del self[i]
+            return
+        i,j=self._locate(self._normalize(index))
+        self._delete(i,j)
+
+    def __contains__(self,value):
+        i=bisect_left(self._maxes,value)
+        if i==len(self._maxes):
+            return False
+        chunk=self._lists[i]
+        return chunk[bisect_left(chunk,value)]==value
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for chunk in self._lists:
+            yield from chunk
+
+    def __reversed__(self):
+        for chunk in reversed(self._lists):
+            yield from reversed(chunk)
+
+    def __eq__(self,other):
+        if not hasattr(other,"__len__") or len(self)!=len(other):
+            return False
+        return all(a==b for a,b in zip(self,other))
+
+    def __repr__(self):
+        return f"SortedList({list(self)!r})"
+
+# add / remove / bisect / rank / index: TC=O(log n) + O(LOAD) memmove inside one chunk
+# iteration: O(n), SC=O(n)
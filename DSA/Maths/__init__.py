@@ -0,0 +1,5 @@
+from .combinatorics import Combinatorics
+from .factorial import factorial, factorial_mod, factorialSwing, productTree
+from .fibonacci import fibDoubling, fibMatrix, fibonacci, fibPair, fib_mod
+from .fibonacci_batch import fibModBatch, pisanoPeriod
+from .primes import factorize, isPrime, primeSieve
@@ -0,0 +1,127 @@
+# O(1) nCr / nPr / multinomial mod a prime from precomputed tables
+#
+# fact[i]    = i! mod p
+# invFact[i] = (i!)^-1 mod p, built backwards from one modular inverse:
+#              invFact[i-1] = invFact[i] * i
+# both tables are array('q') and can be written to / read from disk as raw bytes
+import math
+import os
+import struct
+from array import array
+
+MAGIC=b"NCRTBL1\0"
+HEADER=struct.Struct("<8sqq")
+
+class Combinatorics:
+    def __init__(self,mod,max_n,fact=None,invFact=None):
+        if not 1<mod<2**63:
+            raise ValueError("mod must fit in a signed 64-bit integer")
+        if max_n<0:
+            raise ValueError("max_n must be >= 0")
+        self.mod=mod
+        self.max_n=max_n
+        if fact is None:
+            fact,invFact=self.buildTables(mod,max_n)
+        self.fact=fact
+        self.invFact=invFact
+
+    @staticmethod
+    def buildTables(mod,max_n):
+        fact=array("q",bytes(8*(max_n+1)))
+        fact[0]=1
+        value=1
+        for i in range(1,max_n+1):
+            value=value*i%mod
+            fact[i]=value
+        # max_n! must be invertible: true for a prime larger than max_n, and for any
+        # modulus sharing no factor with 1..max_n
+        if math.gcd(value,mod)!=1:
+            raise ValueError("mod must be a prime larger than max_n")
+        invFact=array("q",bytes(8*(max_n+1)))
+        inv=pow(value,-1,mod)
+        invFact[max_n]=inv
+        for i in range(max_n,0,-1):
+            inv=inv*i%mod
+            invFact[i-1]=inv
+        return fact,invFact
+
+    # ---------- queries ----------
+
+    def checkN(self,n):
+        if n>self.max_n:
+            raise ValueError(f"n={n} is larger than max_n={self.max_n}")
+
+    def nCr(self,n,r):
+        if r<0 or r>n or n<0:
+            return 0
+        self.checkN(n)
+        return self.fact[n]*self.invFact[r]%self.mod*self.invFact[n-r]%self.mod
+
+    def nPr(self,n,r):
+        if r<0 or r>n or n<0:
+            return 0
+        self.checkN(n)
+        return self.fact[n]*self.invFact[n-r]%self.mod
+
+    def multinomial(self,*ks):
+        # (k1 + k2 + ...)! / (k1! * k2! * ...)
+        if any(k<0 for k in ks):
+            return 0
+        total=sum(ks)
+        self.checkN(total)
+        result=self.fact[total]
+        for k in ks:
+            result=result*self.invFact[k]%self.mod
+        return result
+
+    def nCrBatch(self,ns,rs):
+        # nCr for every pair (ns[i], rs[i]), returned as array('q')
+        fact,invFact,mod=self.fact,self.invFact,self.mod
+        # ns is read twice (bound check + values): iterators and numpy arrays become a list
+        ns=list(ns)
+        if ns and max(ns)>self.max_n:
+            self.checkN(max(ns))
+        return array("q",[fact[n]*invFact[r]%mod*invFact[n-r]%mod if 0<=r<=n else 0 for n,r in zip(ns,rs)])
+
+    def nPrBatch(self,ns,rs):
+        fact,invFact,mod=self.fact,self.invFact,self.mod
+        ns=list(ns)
+        if ns and max(ns)>self.max_n:
+            self.checkN(max(ns))
+        return array("q",[fact[n]*invFact[n-r]%mod if 0<=r<=n else 0 for n,r in zip(ns,rs)])
+
+    # ---------- disk ----------
+
+    def save(self,path):
+        with open(path,"wb") as f:
+            f.write(HEADER.pack(MAGIC,self.mod,self.max_n))
+            self.fact.tofile(f)
+            self.invFact.tofile(f)
+
+    @classmethod
+    def load(cls,path):
+        with open(path,"rb") as f:
+            magic,mod,max_n=HEADER.unpack(f.read(HEADER.size))
+            if magic!=MAGIC:
+                raise ValueError(f"{path} is not a Combinatorics table file")
+            fact=array("q")
+            fact.fromfile(f,max_n+1)
+            invFact=array("q")
+            invFact.fromfile(f,max_n+1)
+        return cls(mod,max_n,fact,invFact)
+
+    @classmethod
+    def cached(cls,mod,max_n,path):
+        # load the tables from path if they cover (mod, max_n), else build and save them
+        if os.path.exists(path):
+            table=cls.load(path)
+            if table.mod==mod and table.max_n>=max_n:
+                return table
+        table=cls(mod,max_n)
+        table.save(path)
+        return table
+
+    def __repr__(self):
+        return f"Combinatorics(mod={self.mod}, max_n={self.max_n})"
+
+# build: TC=O(max_n), SC=O(max_n) (16 bytes per n); nCr / nPr: O(1); multinomial: O(number of parts)
@@ -0,0 +1,92 @@
+# iterative factorial for huge n (BasicToAdvance/4_FactorialRecursion.py recurses n times
+# and multiplies one small number at a time)
+#
+# prime swing (Luschny): n! = ((n//2)!)^2 * swing(n), where swing(n) = n! / ((n//2)!)^2
+# only has prime factors <= n, each with exponent sum(n // p^k mod 2 for k >= 1).
+# The factors are multiplied with a balanced product tree so the big multiplications
+# are between numbers of similar size (that is where Karatsuba pays off).
+#
+# gmpy2 is optional; when it is installed factorial() uses its C implementation
+from .primes import isPrime, primeSieve
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2=None
+
+SMALL_FACTORIAL=20
+
+def productTree(values):
+    # product of a list of ints by multiplying neighbours pairwise (binary splitting)
+    values=list(values)
+    if not values:
+        return 1
+    while len(values)>1:
+        paired=[values[i]*values[i+1] for i in range(0,len(values)-1,2)]
+        if len(values)&1:
+            paired.append(values[-1])
+        values=paired
+    return values[0]
+
+def rangeProduct(lo,hi):
+    # lo * (lo+1) * ... * hi by binary splitting
+    if lo>hi:
+        return 1
+    return productTree(range(lo,hi+1))
+
+def swing(n,primes):
+    # n! / ((n//2)!)^2 from the primes <= n
+    factors=[]
+    for p in primes:
+        if p>n:
+            break
+        q=n
+        e=0
+        while q:
+            q//=p
+            e+=q&1
+        if e:
+            factors.append(p if e==1 else p**e)
+    return productTree(factors)
+
+def factorialSwing(n):
+    if n<0:
+        raise ValueError("factorial() not defined for negative values")
+    if n<SMALL_FACTORIAL:
+        return rangeProduct(2,n)
+    primes=primeSieve(n)
+    sizes=[]
+    while n>=SMALL_FACTORIAL:
+        sizes.append(n)
+        n//=2
+    result=rangeProduct(2,n)
+    for m in reversed(sizes):
+        result=result*result*swing(m,primes)
+    return result
+
+def factorial(n):
+    if gmpy2 is not None and n>=0:
+        return int(gmpy2.fac(n))
+    return factorialSwing(n)
+
+def factorial_mod(n,p):
+    # n! mod p; for a prime p Wilson's theorem (p-1)! = -1 covers n close to p
+    if n<0:
+        raise ValueError("factorial() not defined for negative values")
+    if p<=0:
+        raise ValueError("modulus must be positive")
+    if n>=p:
+        return 0
+    if p-n<n and isPrime(p):
+        # n! = -1 / ((n+1) * ... * (p-1)) mod p
+        rest=1
+        for k in range(n+1,p):
+            rest=rest*k%p
+        return (-pow(rest,-1,p))%p
+    result=1%p
+    for k in range(2,n+1):
+        result=result*k%p
+    return result
+
+# factorial: TC=O(M(n log n) log n) with M the cost of one big multiplication, SC=O(n log n) bits
+# factorial_mod: TC=O(min(n, p-n)), SC=O(1)
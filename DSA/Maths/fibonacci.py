@@ -0,0 +1,93 @@
+# O(log n) Fibonacci numbers (the naive recursion in BasicToAdvance/7_FibonacciNumber.py is O(2^n))
+#
+# fast doubling, from F(k) and F(k+1):
+#   F(2k)   = F(k+1)^2 - (F(k+1) - F(k))^2
+#   F(2k+1) = F(k)^2 + F(k+1)^2
+# three squarings per bit of n, and the last (biggest) step only computes the one value we need
+#
+# matrix power: [[1,1],[1,0]]^n = [[F(n+1),F(n)],[F(n),F(n-1)]]
+#
+# gmpy2 is optional; when it is installed fibonacci() uses its C implementation for huge n
+try:
+    import gmpy2
+except ImportError:
+    gmpy2=None
+
+def fibPair(n,mod=None):
+    # (F(n), F(n+1)) for n >= 0, every step reduced mod `mod` if given
+    a,b=0,1
+    for bit in bin(n)[2:]:
+        a2=a*a
+        b2=b*b
+        c=b2-(b-a)*(b-a)
+        d=a2+b2
+        if bit=="1":
+            a,b=d,c+d
+        else:
+            a,b=c,d
+        if mod is not None:
+            a%=mod
+            b%=mod
+    return a,b
+
+def fibDoubling(n):
+    if n<0:
+        return negative(n,fibDoubling)
+    if n<2:
+        return n
+    # F(n//2) and F(n//2+1), then only the half we need for the last step
+    a,b=fibPair(n>>1)
+    if n&1:
+        return a*a+b*b
+    return a*(2*b-a)
+
+def matMul(x,y,mod):
+    a=x[0]*y[0]+x[1]*y[2]
+    b=x[0]*y[1]+x[1]*y[3]
+    c=x[2]*y[0]+x[3]*y[2]
+    d=x[2]*y[1]+x[3]*y[3]
+    if mod is not None:
+        return (a%mod,b%mod,c%mod,d%mod)
+    return (a,b,c,d)
+
+def fibMatrix(n,mod=None):
+    # 2x2 matrices stored as (a, b, c, d) tuples, square-and-multiply on the bits of n
+    if n<0:
+        return negative(n,lambda k:fibMatrix(k,mod))
+    result=(1,0,0,1)
+    base=(1,1,1,0)
+    while n:
+        if n&1:
+            result=matMul(result,base,mod)
+        base=matMul(base,base,mod)
+        n>>=1
+    return result[1]
+
+def negative(n,f):
+    # F(-n) = (-1)^(n+1) * F(n)
+    value=f(-n)
+    return value if n&1 else -value
+
+def fib_mod(n,m):
+    # F(n) mod m
+    if m<=0:
+        raise ValueError("modulus must be positive")
+    if n<0:
+        return negative(n,lambda k:fib_mod(k,m))%m
+    return fibPair(n,m)[0]%m
+
+METHODS={"doubling":fibDoubling,"matrix":fibMatrix}
+
+def fibonacci(n,method=None):
+    # F(n) as an exact int, method is "doubling", "matrix" or None for the fastest available
+    if method is None:
+        if gmpy2 is not None and n>=0:
+            return int(gmpy2.fib(n))
+        method="doubling"
+    try:
+        return METHODS[method](n)
+    except KeyError:
+        raise ValueError(f"unknown method: {method!r}") from None
+
+# TC=O(log n) arithmetic steps (O(M(n)) bit operations for big n), SC=O(n) bits for the result
+# fib_mod: TC=O(log n) with numbers below m^2, SC=O(1)
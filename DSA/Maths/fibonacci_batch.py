@@ -0,0 +1,94 @@
+# many F(n) mod m queries against a few moduli
+#
+# F(n) mod m repeats with period pi(m) (the Pisano period), so n can always be
+# reduced mod pi(m) first. Per modulus we cache pi(m), and if pi(m) is small
+# enough a table of F(0..pi(m)-1) mod m, which turns every query into a lookup.
+# Without a table the queries run fast doubling, across the whole batch at once
+# with numpy when it is installed.
+import math
+from array import array
+from functools import lru_cache
+
+from .fibonacci import fibPair
+from .primes import factorize
+
+try:
+    import numpy as np
+except ImportError:
+    np=None
+
+TABLE_LIMIT=1<<20
+# numpy keeps products of two residues in int64
+NUMPY_MODULUS_LIMIT=1<<31
+
+def primePisano(p):
+    if p==2:
+        return 3
+    if p==5:
+        return 20
+    # pi(p) divides p-1 when p = +-1 mod 10, and 2(p+1) when p = +-3 mod 10
+    period=p-1 if p%10 in (1,9) else 2*(p+1)
+    for q in factorize(period):
+        while period%q==0 and fibPair(period//q,p)==(0,1):
+            period//=q
+    return period
+
+@lru_cache(maxsize=None)
+def pisanoPeriod(m):
+    # pi(p^k) = p^(k-1) * pi(p), pi(m) = lcm of pi over the prime powers of m
+    if m<=0:
+        raise ValueError("modulus must be positive")
+    period=1
+    for p,k in factorize(m).items():
+        period=math.lcm(period,p**(k-1)*primePisano(p))
+    return period
+
+@lru_cache(maxsize=16)
+def fibTable(m):
+    # F(0..pi(m)-1) mod m, or None when the period is too long to store
+    period=pisanoPeriod(m)
+    if period>TABLE_LIMIT:
+        return None
+    table=array("q",bytes(8*period)) if m<=2**63 else [0]*period
+    a,b=0,1%m
+    for i in range(period):
+        table[i]=a
+        a,b=b,(a+b)%m
+    return table
+
+def fibModVector(ns,m):
+    # fast doubling on numpy int64 vectors, one pass over the bits for the whole batch
+    ns=np.asarray(ns,dtype=np.int64)
+    a=np.zeros(ns.shape,dtype=np.int64)
+    b=np.ones(ns.shape,dtype=np.int64)%m
+    top=int(ns.max()).bit_length() if ns.size else 0
+    for bit in range(top-1,-1,-1):
+        a2=a*a%m
+        b2=b*b%m
+        diff=(b-a)%m
+        c=(b2-diff*diff%m)%m
+        d=(a2+b2)%m
+        odd=((ns>>bit)&1).astype(bool)
+        a=np.where(odd,d,c)
+        b=np.where(odd,(c+d)%m,d)
+    return a
+
+def fibModBatch(ns,m):
+    # F(n) mod m for every n in ns (n >= 0); array('q') result, numpy array on the numpy path
+    period=pisanoPeriod(m)
+    table=fibTable(m)
+    if np is not None and isinstance(ns,np.ndarray):
+        reduced=np.asarray(ns,dtype=np.int64)%period if period<2**63 else np.asarray(ns,dtype=np.int64)
+        if table is not None:
+            return np.asarray(table)[reduced]
+        if m<NUMPY_MODULUS_LIMIT:
+            return fibModVector(reduced,m)
+    if table is not None:
+        out=array("q",[table[n%period] for n in ns])
+    else:
+        values=[fibPair(n%period,m)[0] for n in ns]
+        out=array("q",values) if m<=2**63 else values
+    return out
+
+# pisanoPeriod: one factorization of m per modulus (cached)
+# table queries: O(1) each, table build O(pi(m)) once; other queries O(log pi(m))
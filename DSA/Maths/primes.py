@@ -0,0 +1,94 @@
+# prime sieve, primality test and integer factorization for 64-bit sized numbers
+import math
+import random
+
+SMALL_PRIMES=(2,3,5,7,11,13,17,19,23,29,31,37)
+
+def primeSieve(n):
+    # list of all primes <= n, sieve of Eratosthenes over odd numbers only
+    if n<2:
+        return []
+    # odd[i] stands for the number 2*i+1
+    odd=bytearray([1])*((n+1)//2)
+    odd[0]=0
+    for i in range(1,(math.isqrt(n)-1)//2+1):
+        if odd[i]:
+            p=2*i+1
+            start=p*p//2
+            odd[start::p]=bytes(len(range(start,len(odd),p)))
+    return [2]+[2*i+1 for i,flag in enumerate(odd) if flag]
+
+def isPrime(n):
+    # deterministic Miller-Rabin for n < 3.3e24 (the first 12 primes as bases)
+    if n<2:
+        return False
+    for p in SMALL_PRIMES:
+        if n%p==0:
+            return n==p
+    d=n-1
+    s=0
+    while d%2==0:
+        d//=2
+        s+=1
+    for a in SMALL_PRIMES:
+        x=pow(a,d,n)
+        if x==1 or x==n-1:
+            continue
+        for _ in range(s-1):
+            x=x*x%n
+            if x==n-1:
+                break
+        else:
+            return False
+    return True
+
+def pollardRho(n):
+    # a non-trivial factor of the composite n (Brent's variant)
+    if n%2==0:
+        return 2
+    while True:
+        y=random.randrange(1,n)
+        c=random.randrange(1,n)
+        m=128
+        g=r=q=1
+        while g==1:
+            x=y
+            for _ in range(r):
+                y=(y*y+c)%n
+            k=0
+            while k<r and g==1:
+                ys=y
+                for _ in range(min(m,r-k)):
+                    y=(y*y+c)%n
+                    q=q*abs(x-y)%n
+                g=math.gcd(q,n)
+                k+=m
+            r*=2
+        if g==n:
+            g=1
+            while g==1:
+                ys=(ys*ys+c)%n
+                g=math.gcd(abs(x-ys),n)
+        if g!=n:
+            return g
+
+def factorize(n):
+    # {prime: exponent} for n >= 1
+    factors={}
+    for p in SMALL_PRIMES:
+        while n%p==0:
+            factors[p]=factors.get(p,0)+1
+            n//=p
+    stack=[n] if n>1 else []
+    while stack:
+        x=stack.pop()
+        if isPrime(x):
+            factors[x]=factors.get(x,0)+1
+        else:
+            d=pollardRho(x)
+            stack.append(d)
+            stack.append(x//d)
+    return dict(sorted(factors.items()))
+
+# primeSieve: TC=O(n log log n), SC=O(n/2) bytes
+# isPrime: TC=O(12 log^3 n), factorize: expected O(n^(1/4)) per factor
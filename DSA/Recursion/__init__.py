@@ -0,0 +1,4 @@
+from .iterative import ArrayReverse, Fibonacci, PalindronString, factorial
+from .persistent_cache import CacheInfo, persistent_cache
+from .profiler import RecursionProfile, profile_recursion
+from .trampoline import TailCall, recursive, tail, tailrec, trampoline
@@ -0,0 +1,45 @@
+# the recursive examples from BasicToAdvance/ written as tail calls and compiled
+# into loops by @tailrec, so they run at any input size without touching
+# sys.setrecursionlimit
+from .trampoline import tailrec
+
+@tailrec
+def factorialStep(n,acc):
+    if n<=1:
+        return acc
+    return factorialStep(n-1,acc*n)
+
+def factorial(n):
+    # same result as 4_FactorialRecursion.factorial
+    return factorialStep(n,1)
+
+@tailrec
+def fibonacciStep(n,a,b):
+    if n==0:
+        return a
+    return fibonacciStep(n-1,b,a+b)
+
+def Fibonacci(n):
+    # same result as 7_FibonacciNumber.Fibonacci, but O(n) instead of O(2^n):
+    # (a, b) carries F(k), F(k+1) forward so nothing is computed twice
+    return fibonacciStep(n,0,1)
+
+@tailrec
+def ArrayReverse(num,left,right):
+    # same as 5_ArrayReverseRecursion.ArrayReverse, reverses num[left..right] in place
+    if left>=right:
+        return num
+    num[left],num[right]=num[right],num[left]
+    return ArrayReverse(num,left+1,right-1)
+
+@tailrec
+def PalindronString(str,left,right):
+    # same as 6_PalindromString.PalindronString; the bounds are checked first so
+    # an empty string (right=-1) is a palindrome instead of an IndexError
+    if left>=right:
+        return True
+    if str[left]!=str[right]:
+        return False
+    return PalindronString(str,left+1,right-1)
+
+# factorial / Fibonacci / ArrayReverse / PalindronString: TC=O(n), SC=O(1) besides the data
@@ -0,0 +1,197 @@
+# @persistent_cache: like functools.lru_cache, but the results live in a SQLite
+# file, so they survive restarts and are shared by every process using that file
+#
+#   @persistent_cache("fib.sqlite", maxsize=100000, ttl=24*3600)
+#   def fib(n): ...
+#
+#   fib.cache_info()  -> CacheInfo(hits, misses, maxsize, currsize)
+#   fib.cache_clear()
+#
+# arguments and results are pickled; calls whose arguments or result cannot be
+# pickled are not cached. SQLite runs in WAL mode, so readers and the writer do
+# not block each other, and writers wait for each other up to `timeout` seconds.
+# A hit is a read; it rewrites the entry's access time only when that is more
+# than TOUCH_INTERVAL seconds old, so hot keys cost at most one write per interval.
+# Every insert evicts the least recently used entries in the same transaction, so
+# a function never has more than maxsize entries. Entries older than ttl seconds
+# are misses.
+import functools
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+CacheInfo=namedtuple("CacheInfo",["hits","misses","maxsize","currsize"])
+
+DEFAULT_PATH=os.path.join(os.path.expanduser("~"),".cache","python-dsa","persistent_cache.sqlite")
+# expired entries are purged once every EVICT_EVERY inserts per process
+EVICT_EVERY=64
+# LRU order is kept to this many seconds
+TOUCH_INTERVAL=1.0
+
+SCHEMA="""
+CREATE TABLE IF NOT EXISTS cache (
+    ns TEXT NOT NULL,
+    key BLOB NOT NULL,
+    value BLOB NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (ns, key)
+);
+CREATE INDEX IF NOT EXISTS cache_lru ON cache (ns, accessed);
+CREATE TABLE IF NOT EXISTS sizes (
+    ns TEXT PRIMARY KEY,
+    n INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS cache_insert AFTER INSERT ON cache BEGIN
+    INSERT INTO sizes VALUES (new.ns, 1) ON CONFLICT(ns) DO UPDATE SET n=n+1;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_delete AFTER DELETE ON cache BEGIN
+    UPDATE sizes SET n=n-1 WHERE ns=old.ns;
+END;
+"""
+
+class Store:
+    # one SQLite file; a connection per (process, thread) because sqlite3
+    # connections must not cross threads or be inherited through fork
+    def __init__(self,path,timeout):
+        self.path=path
+        self.timeout=timeout
+        self.local=threading.local()
+
+    def connection(self):
+        conn=getattr(self.local,"conn",None)
+        if conn is None or self.local.pid!=os.getpid():
+            directory=os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory,exist_ok=True)
+            conn=sqlite3.connect(self.path,timeout=self.timeout,isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            counted=conn.execute("SELECT 1 FROM sqlite_master WHERE name='sizes'").fetchone()
+            conn.executescript(SCHEMA)
+            if counted is None:
+                # file written before the size table existed
+                conn.execute("INSERT OR IGNORE INTO sizes SELECT ns, COUNT(*) FROM cache GROUP BY ns")
+            self.local.conn=conn
+            self.local.pid=os.getpid()
+        return conn
+
+    def get(self,ns,key,ttl):
+        conn=self.connection()
+        row=conn.execute("SELECT value, created, accessed FROM cache WHERE ns=? AND key=?",(ns,key)).fetchone()
+        if row is None:
+            return None
+        now=time.time()
+        if ttl is not None and now-row[1]>ttl:
+            conn.execute("DELETE FROM cache WHERE ns=? AND key=?",(ns,key))
+            return None
+        if now-row[2]>TOUCH_INTERVAL:
+            conn.execute("UPDATE cache SET accessed=? WHERE ns=? AND key=?",(now,ns,key))
+        return row
+
+    def put(self,ns,key,value,maxsize):
+        # upsert instead of INSERT OR REPLACE: a replace would not fire the delete
+        # trigger and the size count would drift
+        now=time.time()
+        conn=self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("INSERT INTO cache VALUES (?, ?, ?, ?, ?) ON CONFLICT(ns, key) "
+                         "DO UPDATE SET value=excluded.value, created=excluded.created, accessed=excluded.accessed",
+                         (ns,key,value,now,now))
+            if maxsize is not None:
+                self.trim(ns,maxsize)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def trim(self,ns,maxsize):
+        # drop least recently used entries until at most maxsize are left
+        extra=self.size(ns)-maxsize
+        if extra>0:
+            self.connection().execute("DELETE FROM cache WHERE ns=? AND key IN "
+                                      "(SELECT key FROM cache WHERE ns=? ORDER BY accessed LIMIT ?)",(ns,ns,extra))
+
+    def evict(self,ns,maxsize,ttl):
+        conn=self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if ttl is not None:
+                conn.execute("DELETE FROM cache WHERE ns=? AND created<?",(ns,time.time()-ttl))
+            if maxsize is not None:
+                self.trim(ns,maxsize)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def size(self,ns):
+        # kept by the triggers, so no table scan
+        row=self.connection().execute("SELECT n FROM sizes WHERE ns=?",(ns,)).fetchone()
+        return row[0] if row else 0
+
+    def clear(self,ns):
+        self.connection().execute("DELETE FROM cache WHERE ns=?",(ns,))
+
+def persistent_cache(path=None,maxsize=None,ttl=None,timeout=30.0):
+    # works as @persistent_cache and as @persistent_cache(path, maxsize=..., ttl=...)
+    if callable(path):
+        return persistent_cache()(path)
+    store=Store(path or DEFAULT_PATH,timeout)
+
+    def decorator(func):
+        ns=f"{func.__module__}.{func.__qualname__}"
+        lock=threading.Lock()
+        stats={"hits":0,"misses":0,"inserts":0}
+
+        @functools.wraps(func)
+        def wrapper(*args,**kwargs):
+            try:
+                key=pickle.dumps((args,sorted(kwargs.items())),protocol=4)
+            except Exception:
+                return func(*args,**kwargs)
+            row=store.get(ns,key,ttl)
+            if row is not None:
+                with lock:
+                    stats["hits"]+=1
+                return pickle.loads(row[0])
+            result=func(*args,**kwargs)
+            with lock:
+                stats["misses"]+=1
+            try:
+                value=pickle.dumps(result,protocol=4)
+            except Exception:
+                return result
+            with lock:
+                stats["inserts"]+=1
+                due=stats["inserts"]%EVICT_EVERY==0
+            store.put(ns,key,value,maxsize)
+            if due and ttl is not None:
+                store.evict(ns,maxsize,ttl)
+            return result
+
+        def cache_info():
+            return CacheInfo(stats["hits"],stats["misses"],maxsize,store.size(ns))
+
+        def cache_clear():
+            store.clear(ns)
+            with lock:
+                stats.update(hits=0,misses=0,inserts=0)
+
+        def cache_evict():
+            # apply maxsize / ttl now instead of waiting for the next check
+            store.evict(ns,maxsize,ttl)
+
+        wrapper.cache_info=cache_info
+        wrapper.cache_clear=cache_clear
+        wrapper.cache_evict=cache_evict
+        return wrapper
+
+    return decorator
+
+# hit: one indexed SELECT (+ an UPDATE at most once per TOUCH_INTERVAL per key),
+# miss: the function call + one INSERT and at most a one-row DELETE in one transaction
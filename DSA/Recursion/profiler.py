@@ -0,0 +1,169 @@
+# measure what a recursive function really does instead of estimating it
+# (like the "TC=O(2^n)" comment in BasicToAdvance/7_FibonacciNumber.py)
+#
+#   @profile_recursion(memo_threshold=0.5)
+#   def Fibonacci(n): ...
+#
+#   Fibonacci(20)
+#   print(Fibonacci.profile.summary())
+#   Fibonacci.profile.toJSON("fib.json")
+#   open("fib.folded","w").write(Fibonacci.profile.folded())   # flamegraph.pl / speedscope input
+#
+# per call it records the depth, the arguments and the time spent in the call and
+# everything below it (its subtree). "memo_savings" is the share of calls whose
+# arguments were already seen: the calls a cache would have answered.
+import functools
+import json
+import reprlib
+import time
+from collections import Counter
+
+class CallTree:
+    # flamegraph node: one per distinct stack of frame labels
+    __slots__=("children","self_time","calls")
+
+    def __init__(self):
+        self.children={}
+        self.self_time=0.0
+        self.calls=0
+
+class RecursionProfile:
+    def __init__(self,name,memo_threshold,frame_args):
+        self.name=name
+        self.memo_threshold=memo_threshold
+        self.frame_args=frame_args
+        self.reset()
+
+    def reset(self):
+        self.calls=0
+        self.max_depth=0
+        self.total_time=0.0
+        self.arg_counts=Counter()
+        self.subtree_time=Counter()
+        self.tree=CallTree()
+        # one entry per active call: [start, time spent in children, tree node]
+        self.stack=[]
+
+    # ---------- recording ----------
+
+    def enter(self,key):
+        self.calls+=1
+        self.arg_counts[key]+=1
+        parent=self.stack[-1][2] if self.stack else self.tree
+        label=f"{self.name}{argumentText(key)}" if self.frame_args else self.name
+        node=parent.children.get(label)
+        if node is None:
+            node=parent.children[label]=CallTree()
+        node.calls+=1
+        self.stack.append([time.perf_counter(),0.0,node])
+        if len(self.stack)>self.max_depth:
+            self.max_depth=len(self.stack)
+
+    def leave(self,key):
+        start,childTime,node=self.stack.pop()
+        elapsed=time.perf_counter()-start
+        node.self_time+=elapsed-childTime
+        self.subtree_time[key]+=elapsed
+        if self.stack:
+            self.stack[-1][1]+=elapsed
+        else:
+            self.total_time+=elapsed
+
+    # ---------- report ----------
+
+    def memoSavings(self):
+        if not self.calls:
+            return 0.0
+        return (self.calls-len(self.arg_counts))/self.calls
+
+    def asdict(self,top=10):
+        savings=self.memoSavings()
+        return {
+            "function":self.name,
+            "calls":self.calls,
+            "max_depth":self.max_depth,
+            "distinct_args":len(self.arg_counts),
+            "repeated_calls":self.calls-len(self.arg_counts),
+            "memo_savings":savings,
+            "memoize":savings>self.memo_threshold,
+            "total_time":self.total_time,
+            "top_repeated_args":[{"args":argumentText(k),"calls":c} for k,c in self.arg_counts.most_common(top) if c>1],
+            "slowest_subtrees":[{"args":argumentText(k),"seconds":t} for k,t in self.subtree_time.most_common(top)],
+        }
+
+    def toJSON(self,path=None,top=10):
+        text=json.dumps(self.asdict(top),indent=2)
+        if path is not None:
+            with open(path,"w") as f:
+                f.write(text)
+        return text
+
+    def folded(self):
+        # "f;f;f 1234" lines: stack of frames and self time in microseconds
+        lines=[]
+        todo=[(label,node,label) for label,node in self.tree.children.items()]
+        while todo:
+            label,node,path=todo.pop()
+            micros=int(node.self_time*1e6)
+            if micros:
+                lines.append(f"{path} {micros}")
+            for childLabel,child in node.children.items():
+                todo.append((childLabel,child,f"{path};{childLabel}"))
+        return "\n".join(sorted(lines))
+
+    def summary(self):
+        d=self.asdict()
+        flag="memoize it" if d["memoize"] else "memoization would not help much"
+        return (f"{self.name}: {d['calls']} calls, max depth {d['max_depth']}, "
+                f"{d['distinct_args']} distinct arguments, {d['memo_savings']:.1%} repeated ({flag}), "
+                f"{d['total_time']*1000:.2f} ms")
+
+# shortened repr for unhashable arguments: a few items of each container and
+# the ends of long strings, so a call costs the same whatever the list size
+shortRepr=reprlib.Repr()
+shortRepr.maxlist=shortRepr.maxtuple=shortRepr.maxdict=shortRepr.maxset=8
+shortRepr.maxstring=shortRepr.maxother=60
+
+class Unhashable(str):
+    # key for calls whose arguments cannot be hashed; distinct arguments with
+    # the same shortened repr are counted as repeats
+    __slots__=()
+
+def argumentKey(args,kwargs):
+    key=(args,tuple(sorted(kwargs.items()))) if kwargs else args
+    try:
+        hash(key)
+    except TypeError:
+        return Unhashable(shortRepr.repr(key))
+    return key
+
+def argumentText(key):
+    if isinstance(key,Unhashable):
+        return str(key)
+    return shortRepr.repr(key)
+
+def profile_recursion(func=None,memo_threshold=0.5,frame_args=False):
+    # memo_threshold: flag the function when more than this share of calls repeat arguments
+    # frame_args: put the arguments in the flamegraph frame names (one frame per distinct call path)
+    def decorator(func):
+        profile=RecursionProfile(func.__qualname__,memo_threshold,frame_args)
+
+        @functools.wraps(func)
+        def wrapper(*args,**kwargs):
+            key=argumentKey(args,kwargs)
+            profile.enter(key)
+            try:
+                return func(*args,**kwargs)
+            finally:
+                profile.leave(key)
+
+        wrapper.profile=profile
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+# overhead per call: hashing the arguments (O(1) for scalars, O(size) for hashable
+# containers) or a bounded repr for unhashable ones; keys hold the hashable argument
+# tuples themselves. SC=O(distinct arguments + distinct stacks)
@@ -0,0 +1,167 @@
+# run recursive functions without growing the Python call stack
+#
+# 1. @tailrec for functions that only call themselves in tail position
+#    (return f(...)): the function is recompiled with every such call turned
+#    into "reassign the parameters and loop again", so it runs as fast as a
+#    hand written while loop and needs no stack at all.
+#
+#       @tailrec
+#       def gcd(a,b):
+#           if b==0:
+#               return a
+#           return gcd(b,a%b)
+#
+# 2. @trampoline for tail calls the compiler cannot see (e.g. two functions
+#    calling each other): instead of calling itself the function
+#    returns tail(f, args...), and a loop keeps calling until a real value comes
+#    back. Memory stays O(1) however deep the "recursion" goes.
+#
+#       @trampoline
+#       def countdown(n):
+#           if n==0:
+#               return "done"
+#           return tail(countdown,n-1)
+#
+# 3. @recursive for any recursion: the function is a generator and every
+#    recursive call is yielded; the results come back from the yield. The calls
+#    waiting for a result are kept on an explicit list instead of the C stack.
+#
+#       @recursive
+#       def depth(node):
+#           if node is None:
+#               return 0
+#           return 1+max((yield depth.call(node.left)),(yield depth.call(node.right)))
+import ast
+import functools
+import inspect
+import textwrap
+from types import GeneratorType
+
+class TailCallRewriter(ast.NodeTransformer):
+    # return f(x, y) -> x, y = ..., continue   (only for calls to the function itself)
+    def __init__(self,name,params):
+        self.name=name
+        self.params=params
+        self.rewritten=0
+
+    def tailArguments(self,call):
+        if not (isinstance(call,ast.Call) and isinstance(call.func,ast.Name) and call.func.id==self.name):
+            return None
+        if any(isinstance(a,ast.Starred) for a in call.args) or any(k.arg is None for k in call.keywords):
+            return None
+        if len(call.args)>len(self.params):
+            return None
+        values=dict(zip(self.params,call.args))
+        for k in call.keywords:
+            if k.arg not in self.params or k.arg in values:
+                return None
+            values[k.arg]=k.value
+        if len(values)!=len(self.params):
+            return None
+        return [values[p] for p in self.params]
+
+    def visit_Return(self,node):
+        args=self.tailArguments(node.value)
+        if args is None:
+            return node
+        self.rewritten+=1
+        assign=ast.Assign(
+            targets=[ast.Tuple([ast.Name(p,ast.Store()) for p in self.params],ast.Store())],
+            value=ast.Tuple(args,ast.Load()))
+        return [ast.copy_location(assign,node),ast.copy_location(ast.Continue(),node)]
+
+    # a return inside these does not return from our function, a continue would
+    # hit the wrong loop, or leaving the block early would change when it is
+    # cleaned up, so they are left alone
+    def visit_FunctionDef(self,node):
+        return node
+
+    visit_AsyncFunctionDef=visit_FunctionDef
+    visit_Lambda=visit_FunctionDef
+    visit_ClassDef=visit_FunctionDef
+    visit_With=visit_FunctionDef
+    visit_Try=visit_FunctionDef
+    visit_For=visit_FunctionDef
+    visit_While=visit_FunctionDef
+
+def tailrec(func):
+    source=textwrap.dedent(inspect.getsource(func))
+    tree=ast.parse(source)
+    ast.increment_lineno(tree,func.__code__.co_firstlineno-1)
+    node=tree.body[0]
+    if func.__code__.co_flags&(inspect.CO_GENERATOR|inspect.CO_COROUTINE|inspect.CO_ASYNC_GENERATOR):
+        # `return f(...)` there sets the StopIteration value, it is not a call to loop on
+        raise TypeError("@tailrec cannot rewrite generator or coroutine functions")
+    if not isinstance(node,ast.FunctionDef) or func.__code__.co_freevars:
+        raise TypeError("@tailrec needs a plain function defined at module level")
+    if func.__code__.co_cellvars:
+        # the loop reuses one set of locals, so closures capturing them would all
+        # see the last iteration's values
+        raise TypeError("@tailrec cannot rewrite a function whose variables are captured by closures")
+    spec=node.args
+    if spec.vararg or spec.kwarg or spec.kwonlyargs or spec.posonlyargs:
+        raise TypeError("@tailrec only supports plain positional parameters")
+    params=[a.arg for a in spec.args]
+    rewriter=TailCallRewriter(node.name,params)
+    body=[rewriter.visit(stmt) for stmt in node.body]
+    body=[s for stmt in body for s in (stmt if isinstance(stmt,list) else [stmt])]
+    if not rewriter.rewritten:
+        return func
+    # falling off the end of the body still has to return None
+    body.append(ast.Return(ast.Constant(None)))
+    loop=ast.While(ast.Constant(True),body,[])
+    node.body=[ast.copy_location(loop,node)]
+    node.decorator_list=[]
+    ast.fix_missing_locations(tree)
+    namespace={}
+    exec(compile(tree,inspect.getsourcefile(func) or "<tailrec>","exec"),func.__globals__,namespace)
+    loopFunc=namespace[node.name]
+    loopFunc.__defaults__=func.__defaults__
+    return functools.update_wrapper(loopFunc,func)
+
+class TailCall:
+    __slots__=("func","args")
+
+    def __init__(self,func,args):
+        self.func=func
+        self.args=args
+
+def tail(func,*args):
+    # returned by a @trampoline function instead of calling func(*args)
+    return TailCall(getattr(func,"__wrapped__",func),args)
+
+def trampoline(func):
+    @functools.wraps(func)
+    def wrapper(*args):
+        result=func(*args)
+        while type(result) is TailCall:
+            result=result.func(*result.args)
+        return result
+    return wrapper
+
+def runGenerator(gen):
+    # drives a generator that yields generators (sub-calls) until the first one returns
+    stack=[gen]
+    value=None
+    while stack:
+        try:
+            child=stack[-1].send(value)
+        except StopIteration as done:
+            stack.pop()
+            value=done.value
+            continue
+        if type(child) is not GeneratorType:
+            raise TypeError("@recursive functions must yield f.call(...) sub-calls")
+        stack.append(child)
+        value=None
+    return value
+
+def recursive(func):
+    @functools.wraps(func)
+    def wrapper(*args,**kwargs):
+        return runGenerator(func(*args,**kwargs))
+    # f.call(...) creates the sub-call without running it
+    wrapper.call=func
+    return wrapper
+
+# tailrec / trampoline: O(1) extra memory per step. recursive: one generator object per pending call
@@ -6,5 +6,6 @@ def selectionSort(num):
                 minIdex=j
         num[i],num[minIdex]=num[minIdex],num[i]
     return num
-l=[5,4,3,2,1]
-print(selectionSort(l))
\ No newline at end of file
+if __name__ == '__main__':
+    l=[5,4,3,2,1]
+    print(selectionSort(l))
@@ -0,0 +1,15 @@
+from .adaptive_sort import adaptiveSort
+from .batch_sort import sortBatch, sortingNetwork
+from .buffer_sort import bufferSort
+from .engine import ALGORITHMS, chooseAlgorithm, registerAlgorithm, selectionSort, sort
+from .external_sort import externalSort
+from .heap_sort import heapSort
+from .instrument import SortStats, instrumented
+from .insertion_sort import insertionSort
+from .intro_sort import introSort
+from .kway_merge import kwayMerge, mergeFiles
+from .merge_sort import mergeSort
+from .parallel_sort import parallelSort
+from .radix_sort import countingSort, lsdRadixSort, msdRadixSort, radixSortRecords
+from .record_sort import recordOrder, recordSort
+from .selection import introSelect, nlargest, nsmallest, select_k
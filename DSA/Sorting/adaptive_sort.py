@@ -0,0 +1,70 @@
+# natural merge sort: find the runs that already exist in the input and only
+# merge those, so presorted / reversed / nearly sorted data costs close to O(n)
+from . import instrument
+from .insertion_sort import insertionSort
+from .merge_sort import merge
+
+MIN_RUN=32
+
+def findRuns(num):
+    # returns run boundaries [0, b1, b2, ..., n]; strictly descending runs are
+    # reversed in place (strict so that stability is kept)
+    n=len(num)
+    bounds=[0]
+    lo=0
+    while lo<n:
+        hi=lo+1
+        if hi<n and num[hi]<num[lo]:
+            while hi<n and num[hi]<num[hi-1]:
+                hi+=1
+            num[lo:hi]=num[lo:hi][::-1]
+        else:
+            while hi<n and not num[hi]<num[hi-1]:
+                hi+=1
+        # short runs are extended with insertion sort so we never merge tiny pieces
+        if hi-lo<MIN_RUN and hi<n:
+            end=min(lo+MIN_RUN,n)
+            insertionSort(num,lo,end)
+            hi=end
+        bounds.append(hi)
+        lo=hi
+    return bounds
+
+def countRuns(num,limit=None):
+    # number of ascending/descending runs, stops early once limit is reached
+    n=len(num)
+    runs=0
+    i=0
+    while i<n:
+        runs+=1
+        if limit is not None and runs>=limit:
+            return runs
+        i+=1
+        if i<n and num[i]<num[i-1]:
+            while i<n and num[i]<num[i-1]:
+                i+=1
+        else:
+            while i<n and not num[i]<num[i-1]:
+                i+=1
+    return runs
+
+def adaptiveSort(num):
+    with instrument.phase("runs"):
+        bounds=findRuns(num)
+    buf=[None]*(len(num)//2+1)
+    stats=instrument.active()
+    if stats is not None:
+        stats.allocated(len(buf))
+    # merge neighbouring runs pairwise until one is left (balanced, stable)
+    with instrument.phase("merge"):
+        while len(bounds)>2:
+            merged=[0]
+            for i in range(0,len(bounds)-2,2):
+                merge(num,buf,bounds[i],bounds[i+1],bounds[i+2])
+                merged.append(bounds[i+2])
+            if len(bounds)%2==0:
+                merged.append(bounds[-1])
+            bounds=merged
+    return num
+
+# TC=O(n log r) where r is the number of runs, O(n) on sorted input. SC=O(n/2). Stable.
@@ -0,0 +1,86 @@
+# sort many small rows (4..32 items) at once
+#
+# a sorting network is a fixed list of compare-exchange pairs (i, j) that sorts
+# any input of its size. Because the pairs do not depend on the data, one pair
+# can be applied to the same two columns of every row at the same time, which is
+# what the numpy path does: ~O(w log^2 w) vector operations for the whole batch.
+#
+# numpy is optional; without it lists of rows are sorted with list.sort() per row
+from array import array
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np=None
+
+NETWORK_MAX=32
+
+@lru_cache(maxsize=None)
+def sortingNetwork(n):
+    # Batcher's odd-even merge sort network for n inputs, tuple of (i, j) with i<j
+    pairs=[]
+    p=1
+    while p<n:
+        k=p
+        while k>=1:
+            for j in range(k%p,n-k,2*k):
+                for i in range(min(k,n-j-k)):
+                    if (i+j)//(2*p)==(i+j+k)//(2*p):
+                        pairs.append((i+j,i+j+k))
+            k//=2
+        p*=2
+    return tuple(pairs)
+
+def applyNetwork(row,pairs):
+    # plain Python version, mainly useful to check a network
+    for i,j in pairs:
+        if row[j]<row[i]:
+            row[i],row[j]=row[j],row[i]
+    return row
+
+def sortMatrix(matrix):
+    # numpy 2-D array, every row sorted in place
+    rows,width=matrix.shape
+    # min/max turn a (nan, 1.0) pair into (nan, nan); numpy's sort keeps the
+    # values and puts NaN last
+    hasNan=matrix.dtype.kind in "fc" and bool(np.isnan(matrix).any())
+    if width>NETWORK_MAX or rows<width or hasNan:
+        matrix.sort(axis=1)
+        return matrix
+    # one contiguous array per column so every compare-exchange is two vector ops
+    cols=np.ascontiguousarray(matrix.T)
+    low=np.empty(rows,dtype=matrix.dtype)
+    for i,j in sortingNetwork(width):
+        a,b=cols[i],cols[j]
+        np.minimum(a,b,out=low)
+        np.maximum(a,b,out=b)
+        a[:]=low
+    matrix[:]=cols.T
+    return matrix
+
+def sortBatch(rows,width=None):
+    # rows can be
+    #   a 2-D numpy array                -> every row sorted with a sorting network
+    #   an array / buffer plus width     -> rows of `width` items stored back to back
+    #   a list of lists                  -> every list sorted
+    if np is not None and isinstance(rows,np.ndarray):
+        if rows.ndim!=2:
+            raise ValueError("expected a 2-D array")
+        return sortMatrix(rows)
+    if width is not None:
+        if len(rows)%width:
+            raise ValueError(f"length {len(rows)} is not a multiple of width {width}")
+        with memoryview(rows) as view:
+            fmt=view.format.lstrip("@=<>!")
+        if np is not None:
+            sortMatrix(np.frombuffer(rows,dtype=fmt).reshape(-1,width))
+            return rows
+        for lo in range(0,len(rows),width):
+            rows[lo:lo+width]=array(fmt,sorted(rows[lo:lo+width]))
+        return rows
+    for row in rows:
+        row.sort()
+    return rows
+
+# network size for w inputs: O(w log^2 w) pairs (19 for 8, 63 for 16, 191 for 32)
@@ -0,0 +1,185 @@
+# benchmark every sorting algorithm on realistic input shapes
+#
+#   python -m DSA.Sorting.benchmark --max-size 100000 --save baseline.json
+#   python -m DSA.Sorting.benchmark --max-size 100000 --check baseline.json
+#
+# --check exits with status 1 if any case got slower than baseline*tolerance
+# (and by more than --min-ms, so sub-millisecond noise does not count)
+# or needs more comparisons than before, or if introsort falls back to heap sort
+# on sorted or reversed input, or if sort() gets an array('q') / array('d') wrong
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from array import array
+
+from .engine import ALGORITHMS, NON_COMPARISON, sort
+from .instrument import instrumented
+
+SIZES=[10**e for e in range(2,8)]
+# O(n^2) algorithms are skipped above this size
+QUADRATIC=("selection","insertion")
+QUADRATIC_LIMIT=5000
+REPEAT=7
+# timing differences below this many seconds are treated as noise
+MIN_SECONDS=0.001
+
+def sortedInput(n,rng):
+    return list(range(n))
+
+def reversedInput(n,rng):
+    return list(range(n,0,-1))
+
+def randomInput(n,rng):
+    return [rng.randrange(10*n) for _ in range(n)]
+
+def fewUniqueInput(n,rng):
+    return [rng.randrange(8) for _ in range(n)]
+
+def organPipeInput(n,rng):
+    half=n//2
+    return list(range(half))+list(range(n-half,0,-1))
+
+def nearlySortedInput(n,rng):
+    data=list(range(n))
+    # about 1% of the items swapped with a close neighbour
+    for _ in range(max(1,n//100)):
+        i=rng.randrange(n)
+        j=min(n-1,i+rng.randrange(1,11))
+        data[i],data[j]=data[j],data[i]
+    return data
+
+DISTRIBUTIONS={
+    "sorted":sortedInput,
+    "reversed":reversedInput,
+    "random":randomInput,
+    "few_unique":fewUniqueInput,
+    "organ_pipe":organPipeInput,
+    "nearly_sorted":nearlySortedInput,
+}
+
+def countComparisons(algorithm,data):
+    # (comparisons or None for non-comparison sorts, heap sort fallbacks)
+    with instrumented() as stats:
+        sort(list(data),algorithm)
+    if stats.algorithm in NON_COMPARISON:
+        return None,stats.fallbacks
+    return stats.comparisons,stats.fallbacks
+
+def peakMemory(algorithm,data):
+    copy=list(data)
+    tracemalloc.start()
+    sort(copy,algorithm)
+    peak=tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+def medianTime(algorithm,data,repeat):
+    # the median is steadier than the best run from one invocation to the next
+    times=[]
+    for _ in range(repeat):
+        copy=list(data)
+        start=time.perf_counter()
+        sort(copy,algorithm)
+        times.append(time.perf_counter()-start)
+    return statistics.median(times)
+
+def runCase(algorithm,data,repeat):
+    try:
+        seconds=medianTime(algorithm,data,repeat)
+    except TypeError:
+        # e.g. msd radix sort on integers
+        return None
+    comparisons,fallbacks=countComparisons(algorithm,data)
+    return {"seconds":seconds,"comparisons":comparisons,"fallbacks":fallbacks,"peak_bytes":peakMemory(algorithm,data)}
+
+def runSuite(sizes=SIZES,algorithms=None,distributions=None,repeat=REPEAT,seed=0,log=None):
+    algorithms=algorithms or ["auto"]+list(ALGORITHMS)
+    distributions=distributions or list(DISTRIBUTIONS)
+    results={}
+    for n in sizes:
+        for dist in distributions:
+            data=DISTRIBUTIONS[dist](n,random.Random(seed))
+            for algorithm in algorithms:
+                if algorithm in QUADRATIC and n>QUADRATIC_LIMIT:
+                    continue
+                stats=runCase(algorithm,data,repeat)
+                if stats is None:
+                    continue
+                name=f"{algorithm}/{dist}/{n}"
+                results[name]=stats
+                if log:
+                    log(f"{name:32} {stats['seconds']*1000:10.2f} ms {stats['comparisons'] or '-':>12} cmp {stats['peak_bytes']:>12} B")
+    return results
+
+def compare(results,baseline,tolerance,min_seconds=MIN_SECONDS):
+    # list of human readable regressions, empty if everything is fine
+    problems=[]
+    for name,old in baseline.items():
+        new=results.get(name)
+        if new is None:
+            continue
+        if new["seconds"]>old["seconds"]*tolerance and new["seconds"]-old["seconds"]>min_seconds:
+            problems.append(f"{name}: {old['seconds']*1000:.2f} ms -> {new['seconds']*1000:.2f} ms")
+        if old["comparisons"] is not None and new["comparisons"] is not None and new["comparisons"]>old["comparisons"]:
+            problems.append(f"{name}: {old['comparisons']} -> {new['comparisons']} comparisons")
+    return problems
+
+def checkFallbacks(results):
+    # presorted input must never push introsort into its heap sort fallback
+    problems=[]
+    for name,stats in results.items():
+        dist=name.split("/")[1]
+        if dist in ("sorted","reversed") and stats.get("fallbacks"):
+            problems.append(f"{name}: {stats['fallbacks']} heap sort fallbacks")
+    return problems
+
+def checkArrays(sizes,seed=0):
+    # the auto path on typed arrays: every input shape, integer and float items
+    problems=[]
+    for n in sizes:
+        for dist,make in DISTRIBUTIONS.items():
+            values=make(n,random.Random(seed))
+            for typecode in ("q","d"):
+                data=array(typecode,values)
+                try:
+                    sort(data)
+                except Exception as error:
+                    problems.append(f"auto/{dist}/{n} array('{typecode}'): {error!r}")
+                    continue
+                if data.tolist()!=sorted(data.tolist()):
+                    problems.append(f"auto/{dist}/{n} array('{typecode}'): not sorted")
+    return problems
+
+def main(argv=None):
+    parser=argparse.ArgumentParser(description="sorting benchmark")
+    parser.add_argument("--max-size",type=int,default=10**5)
+    parser.add_argument("--algorithms",nargs="*")
+    parser.add_argument("--distributions",nargs="*",choices=list(DISTRIBUTIONS))
+    parser.add_argument("--repeat",type=int,default=REPEAT)
+    parser.add_argument("--seed",type=int,default=0)
+    parser.add_argument("--save",metavar="JSON")
+    parser.add_argument("--check",metavar="JSON")
+    parser.add_argument("--tolerance",type=float,default=1.5)
+    parser.add_argument("--min-ms",type=float,default=MIN_SECONDS*1000,help="ignore slowdowns smaller than this")
+    args=parser.parse_args(argv)
+    sizes=[n for n in SIZES if n<=args.max_size]
+    results=runSuite(sizes,args.algorithms,args.distributions,args.repeat,args.seed,log=print)
+    if args.save:
+        with open(args.save,"w") as f:
+            json.dump(results,f,indent=2,sort_keys=True)
+    if args.check:
+        with open(args.check) as f:
+            problems=compare(results,json.load(f),args.tolerance,args.min_ms/1000)
+        problems+=checkFallbacks(results)
+        problems+=checkArrays(sizes,args.seed)
+        for p in problems:
+            print("REGRESSION",p)
+        return 1 if problems else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+# in-place sort of any writable buffer of numbers (array, bytearray, mmap,
+# memoryview, numpy arrays...) through memoryview, without building a list of the whole thing
+#
+# 1. cut the buffer into blocks and sort each block with sorted(); only one block
+#    is ever turned into Python objects at a time
+# 2. k-way merge all blocks into a raw scratch buffer of the same format and copy it back
+#
+# memory on top of the data: one block of Python objects + n*itemsize raw bytes
+import heapq
+from array import array
+
+from . import instrument
+
+BLOCK=1<<16
+FORMATS="bBhHiIlLqQfd"
+
+def formatOf(view,typecode):
+    if typecode is not None:
+        return typecode
+    fmt=view.format.lstrip("@=<>!")
+    if fmt not in FORMATS:
+        raise TypeError(f"cannot sort buffers of format {view.format!r}")
+    return fmt
+
+def bufferSort(buf,typecode=None,block=BLOCK):
+    # typecode reinterprets a raw byte buffer, e.g. bufferSort(mm, "d") for an mmap of doubles
+    with memoryview(buf) as raw:
+        if raw.readonly:
+            raise TypeError("buffer is read-only")
+        fmt=formatOf(raw,typecode)
+        with raw.cast("B") as flat, flat.cast(fmt) as view:
+            sortView(view,fmt,block)
+    return buf
+
+def sortView(view,fmt,block):
+    n=len(view)
+    with instrument.phase("blocks"):
+        for lo in range(0,n,block):
+            hi=min(lo+block,n)
+            view[lo:hi]=array(fmt,sorted(view[lo:hi]))
+    if n<=block:
+        return
+    scratch=array(fmt,bytes(n*view.itemsize))
+    stats=instrument.active()
+    if stats is not None:
+        stats.allocated(n)
+    with instrument.phase("merge"):
+        merged=heapq.merge(*(view[lo:min(lo+block,n)] for lo in range(0,n,block)))
+        pos=0
+        out=array(fmt)
+        for value in merged:
+            out.append(value)
+            if len(out)==block:
+                scratch[pos:pos+block]=out
+                pos+=block
+                out=array(fmt)
+        scratch[pos:pos+len(out)]=out
+        # raw copy back, no Python objects involved
+        with memoryview(scratch) as source:
+            view[:]=source
+
+# TC=O(n log n), SC=O(block) Python objects + O(n) raw bytes
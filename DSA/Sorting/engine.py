@@ -0,0 +1,93 @@
+# one entry point for all the sorting algorithms in this package
+# sort(data, algorithm="auto") sorts data in place and returns it
+import importlib
+from array import array
+
+from . import instrument
+from .adaptive_sort import adaptiveSort, countRuns
+from .buffer_sort import FORMATS as BUFFER_FORMATS, bufferSort
+from .heap_sort import heapSort
+from .insertion_sort import insertionSort
+from .intro_sort import introSort
+from .merge_sort import mergeSort
+from .radix_sort import countingSort, integerRange, lsdRadixSort, msdRadixSort
+
+# the file name starts with a digit so it cannot be imported with a normal import
+selectionSort=importlib.import_module(__package__+".01_selection_sort").selectionSort
+
+ALGORITHMS={
+    "selection":selectionSort,
+    "insertion":insertionSort,
+    "intro":introSort,
+    "merge":mergeSort,
+    "heap":heapSort,
+    "adaptive":adaptiveSort,
+    "counting":countingSort,
+    "radix":lsdRadixSort,
+    "msd":msdRadixSort,
+    "buffer":bufferSort,
+}
+
+SMALL_INPUT=32
+# if the data splits into at most n/RUN_RATIO runs it counts as presorted
+RUN_RATIO=64
+# these do not compare items, so instrumentation must not wrap them
+NON_COMPARISON=("counting","radix","msd")
+# these work on the raw buffer and are only timed, not counted
+UNTRACED=("buffer",)
+# counting sort is used while the key range is at most this many times n
+COUNTING_RATIO=2
+# wider integer ranges than this go back to a comparison sort
+RADIX_MAX_BITS=64
+
+def registerAlgorithm(name,func):
+    # func(num) must sort num in place and return it
+    if name=="auto":
+        raise ValueError("'auto' is reserved")
+    ALGORITHMS[name]=func
+
+def chooseAlgorithm(num):
+    if not isinstance(num,(list,array)):
+        # memoryview, bytearray, mmap, numpy... sort the raw buffer in place;
+        # other mutable sequences (UserList...) take the comparison path below
+        try:
+            memoryview(num).release()
+        except TypeError:
+            pass
+        else:
+            return "buffer"
+    n=len(num)
+    if n<=SMALL_INPUT:
+        return "insertion"
+    limit=n//RUN_RATIO+1
+    if countRuns(num,limit+1)<=limit:
+        return "adaptive"
+    keys=integerRange(num)
+    if keys is not None:
+        span=keys[1]-keys[0]
+        if span<=COUNTING_RATIO*n:
+            return "counting"
+        if span.bit_length()<=RADIX_MAX_BITS:
+            return "radix"
+    if isinstance(num,array) and num.typecode in BUFFER_FORMATS:
+        return "buffer"
+    if all(type(x) is str for x in num) or all(type(x) is bytes for x in num):
+        return "msd"
+    return "intro"
+
+def sort(data,algorithm="auto"):
+    if algorithm=="auto":
+        with instrument.phase("choose"):
+            algorithm=chooseAlgorithm(data)
+    try:
+        func=ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"unknown sorting algorithm: {algorithm!r}") from None
+    stats=instrument.active()
+    if stats is not None:
+        stats.algorithm=algorithm
+        if algorithm in UNTRACED:
+            with instrument.phase("sort"):
+                return func(data)
+        return instrument.traced(func,data,compare=algorithm not in NON_COMPARISON)
+    return func(data)
@@ -0,0 +1,174 @@
+# external merge sort for files that do not fit in memory
+# phase 1: read as much as the memory budget allows, sort it, write it to a spill file (a "run")
+# phase 2: k-way merge the runs with a heap, reading every run through a small buffer
+#
+# text files are sorted line by line (key= works like in sorted()),
+# binary files of fixed width numbers are sorted with typecode= ('q', 'd', 'i', ... as in array)
+import heapq
+import os
+import sys
+import tempfile
+from array import array
+
+MB=1024*1024
+DEFAULT_MEMORY=64*MB
+DEFAULT_BUFFER=256*1024
+
+def fanIn(memory_limit,buffer_size):
+    # how many runs can be merged at once: one read buffer per run plus one for the output
+    return max(2,memory_limit//buffer_size-1)
+
+# ---------- text (line) files ----------
+
+def textRuns(src,memory_limit,key,tmp_dir,buffer_size):
+    runs=[]
+    chunk=[]
+    keys=None if key is None else []
+    used=0
+    with open(src,buffering=buffer_size) as f:
+        for line in f:
+            if not line.endswith("\n"):
+                line+="\n"
+            chunk.append(line)
+            # list slot + the str object
+            used+=8+sys.getsizeof(line)
+            if keys is not None:
+                # the key is computed here so it can be counted: its list slot, the
+                # key object, and a slot + int in the index list it is sorted with
+                k=key(line)
+                keys.append(k)
+                used+=44+sys.getsizeof(k)
+            if used>=memory_limit:
+                runs.append(spillText(chunk,keys,tmp_dir,buffer_size))
+                chunk=[]
+                keys=None if key is None else []
+                used=0
+    if chunk or not runs:
+        runs.append(spillText(chunk,keys,tmp_dir,buffer_size))
+    return runs
+
+def spillText(chunk,keys,tmp_dir,buffer_size):
+    if keys is None:
+        chunk.sort()
+        lines=chunk
+    else:
+        # stable, like chunk.sort(key=key), without computing the keys again
+        order=sorted(range(len(chunk)),key=keys.__getitem__)
+        lines=(chunk[i] for i in order)
+    fd,path=tempfile.mkstemp(prefix="run_",suffix=".txt",dir=tmp_dir)
+    with os.fdopen(fd,"w",buffering=buffer_size) as out:
+        out.writelines(lines)
+    return path
+
+def mergeText(paths,dst,key,buffer_size):
+    files=[open(p,buffering=buffer_size) for p in paths]
+    try:
+        with open(dst,"w",buffering=buffer_size) as out:
+            out.writelines(heapq.merge(*files,key=key))
+    finally:
+        for f in files:
+            f.close()
+
+# ---------- binary fixed width files ----------
+
+def readItems(path,typecode,buffer_size):
+    # yields the numbers of a binary file, buffer_size bytes at a time; fromfile()
+    # fills the array directly, so each open run holds one buffer, not bytes + array
+    count=max(1,buffer_size//array(typecode).itemsize)
+    with open(path,"rb",buffering=0) as f:
+        while True:
+            block=array(typecode)
+            try:
+                block.fromfile(f,count)
+            except EOFError:
+                # short last block: fromfile keeps what it could read
+                pass
+            if not block:
+                return
+            yield from block
+
+def binaryRuns(src,typecode,memory_limit,tmp_dir,buffer_size):
+    itemsize=array(typecode).itemsize
+    # at the peak a run holds one array and a list of boxed numbers (~40 bytes per
+    # item); one more itemsize covers the raw bytes / the old array while they overlap
+    step=max(1,memory_limit//(2*itemsize+40))*itemsize
+    runs=[]
+    with open(src,"rb",buffering=0) as f:
+        while True:
+            raw=f.read(step)
+            if not raw:
+                break
+            if len(raw)%itemsize:
+                raise ValueError(f"{src} is not a whole number of {itemsize}-byte items")
+            block=array(typecode)
+            block.frombytes(raw)
+            # drop each copy as soon as the next one exists, so only two are alive
+            del raw
+            values=block.tolist()
+            del block
+            values.sort()
+            block=array(typecode,values)
+            del values
+            fd,path=tempfile.mkstemp(prefix="run_",suffix=".bin",dir=tmp_dir)
+            with os.fdopen(fd,"wb") as out:
+                block.tofile(out)
+            runs.append(path)
+    if not runs:
+        fd,path=tempfile.mkstemp(prefix="run_",suffix=".bin",dir=tmp_dir)
+        os.close(fd)
+        runs.append(path)
+    return runs
+
+def mergeBinary(paths,dst,typecode,buffer_size):
+    itemsize=array(typecode).itemsize
+    batch=max(1,buffer_size//itemsize)
+    merged=heapq.merge(*(readItems(p,typecode,buffer_size) for p in paths))
+    with open(dst,"wb") as out:
+        block=array(typecode)
+        for value in merged:
+            block.append(value)
+            if len(block)>=batch:
+                block.tofile(out)
+                block=array(typecode)
+        block.tofile(out)
+
+# ---------- driver ----------
+
+def externalSort(src,dst,memory_limit=DEFAULT_MEMORY,key=None,typecode=None,
+                 buffer_size=DEFAULT_BUFFER,tmp_dir=None):
+    # sorts the file src into dst using about memory_limit bytes of RAM
+    if memory_limit<2*buffer_size:
+        buffer_size=max(4096,memory_limit//4)
+    if typecode is None:
+        runs=textRuns(src,memory_limit,key,tmp_dir,buffer_size)
+        merge=lambda paths,out:mergeText(paths,out,key,buffer_size)
+    else:
+        if key is not None:
+            raise ValueError("key is only supported for text files")
+        runs=binaryRuns(src,typecode,memory_limit,tmp_dir,buffer_size)
+        merge=lambda paths,out:mergeBinary(paths,out,typecode,buffer_size)
+    width=fanIn(memory_limit,buffer_size)
+    nextRuns=[]
+    try:
+        # merge in passes until the remaining runs fit in one k-way merge
+        while len(runs)>width:
+            nextRuns=[]
+            for i in range(0,len(runs),width):
+                group=runs[i:i+width]
+                fd,path=tempfile.mkstemp(prefix="run_",dir=tmp_dir)
+                os.close(fd)
+                # listed before the merge so a failed pass still cleans it up
+                nextRuns.append(path)
+                merge(group,path)
+                for p in group:
+                    os.remove(p)
+            runs=nextRuns
+        merge(runs,dst)
+    finally:
+        for p in runs+nextRuns:
+            if os.path.exists(p):
+                os.remove(p)
+    return dst
+
+# TC=O(n log n) comparisons, the data is read and written 1 + ceil(log_k(runs)) times
+# SC=O(memory_limit)
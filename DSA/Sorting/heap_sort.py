@@ -0,0 +1,27 @@
+# in-place max-heap sort on the slice num[lo:hi]
+def siftDown(num,lo,root,end):
+    # end is exclusive, indices are relative to lo
+    value=num[lo+root]
+    child=2*root+1
+    while child<end:
+        if child+1<end and num[lo+child]<num[lo+child+1]:
+            child+=1
+        if not value<num[lo+child]:
+            break
+        num[lo+root]=num[lo+child]
+        root=child
+        child=2*root+1
+    num[lo+root]=value
+
+def heapSort(num,lo=0,hi=None):
+    if hi is None:
+        hi=len(num)
+    n=hi-lo
+    for root in range(n//2-1,-1,-1):
+        siftDown(num,lo,root,n)
+    for end in range(n-1,0,-1):
+        num[lo],num[lo+end]=num[lo+end],num[lo]
+        siftDown(num,lo,0,end)
+    return num
+
+# TC=O(n log n) always and SC=O(1). Not stable.
@@ -0,0 +1,14 @@
+# insertion sort on the slice num[lo:hi], used for small inputs and small partitions
+def insertionSort(num,lo=0,hi=None):
+    if hi is None:
+        hi=len(num)
+    for i in range(lo+1,hi):
+        value=num[i]
+        j=i-1
+        while j>=lo and value<num[j]:
+            num[j+1]=num[j]
+            j-=1
+        num[j+1]=value
+    return num
+
+# TC=O(n^2) worst, O(n) when the input is already sorted. SC=O(1)
@@ -0,0 +1,103 @@
+# opt-in counters for the sorting algorithms
+#
+#   with instrumented() as stats:
+#       sort(data)
+#   print(stats.comparisons, stats.writes, stats.max_depth, stats.phases)
+#
+# when no instrumented() block is open active() is None and the algorithms only
+# test it once per call (or once per partition), nothing is counted per comparison.
+# The stats live in a ContextVar, so an instrumented() block only sees the sorts of
+# its own thread (or asyncio task); sorts in other threads run untraced.
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+current=ContextVar("sort_stats",default=None)
+NO_PHASE=nullcontext()
+
+class SortStats:
+    def __init__(self):
+        self.algorithm=None
+        self.comparisons=0
+        self.writes=0          # element stores into the data, a swap is 2
+        self.allocations=0     # auxiliary buffers created by the algorithm
+        self.allocated_items=0 # total size of those buffers
+        self.max_depth=0       # deepest recursion / explicit stack
+        self.fallbacks=0       # introsort partitions handed to heap sort
+        self.phases={}         # phase name -> seconds
+
+    def allocated(self,size):
+        self.allocations+=1
+        self.allocated_items+=size
+
+    def depth(self,d):
+        if d>self.max_depth:
+            self.max_depth=d
+
+    def asdict(self):
+        return dict(vars(self))
+
+    def __repr__(self):
+        fields=", ".join(f"{k}={v!r}" for k,v in vars(self).items())
+        return f"SortStats({fields})"
+
+def active():
+    # SortStats of the innermost instrumented() block in this context, or None
+    return current.get()
+
+@contextmanager
+def instrumented():
+    stats=SortStats()
+    token=current.set(stats)
+    try:
+        yield stats
+    finally:
+        current.reset(token)
+
+@contextmanager
+def timedPhase(stats,name):
+    start=time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.phases[name]=stats.phases.get(name,0.0)+time.perf_counter()-start
+
+def phase(name):
+    # with phase("merge"): ... adds the elapsed time to stats.phases["merge"]
+    stats=current.get()
+    if stats is None:
+        return NO_PHASE
+    return timedPhase(stats,name)
+
+class Counted:
+    # wraps one item and counts every < made through it
+    __slots__=("value",)
+
+    def __init__(self,value):
+        self.value=value
+
+    def __lt__(self,other):
+        current.get().comparisons+=1
+        return self.value<other.value
+
+class TracedList(list):
+    # list that counts element stores
+    def __setitem__(self,index,value):
+        if isinstance(index,slice):
+            current.get().writes+=len(range(*index.indices(len(self)))) if index.step else len(value)
+        else:
+            current.get().writes+=1
+        super().__setitem__(index,value)
+
+def traced(func,data,compare=True):
+    # runs func on an instrumented copy of data and copies the result back
+    items=[Counted(x) for x in data] if compare else list(data)
+    work=TracedList(items)
+    with phase("sort"):
+        func(work)
+    result=[c.value for c in work] if compare else list(work)
+    if isinstance(data,list):
+        data[:]=result
+    else:
+        data[:]=type(data)(data.typecode,result) if hasattr(data,"typecode") else result
+    return data
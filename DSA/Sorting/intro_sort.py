@@ -0,0 +1,103 @@
+# introsort: quicksort with a depth limit, falling back to heap sort when the
+# recursion gets too deep and to insertion sort for small partitions
+from . import instrument
+from .heap_sort import heapSort
+from .insertion_sort import insertionSort
+
+SMALL=16
+NINTHER=128
+
+def medianOfThree(num,a,b,c):
+    x,y,z=num[a],num[b],num[c]
+    if x<y:
+        if y<z:
+            return y
+        return z if x<z else x
+    if x<z:
+        return x
+    return z if y<z else y
+
+def ninther(num,lo,hi):
+    # Tukey's median of three medians, sturdier than one median on patterned input
+    step=(hi-lo)//8
+    mid=(lo+hi)//2
+    a=medianOfThree(num,lo,lo+step,lo+2*step)
+    b=medianOfThree(num,mid-step,mid,mid+step)
+    c=medianOfThree(num,hi-1-2*step,hi-1-step,hi-1)
+    x,y,z=(a,b,c) if not b<a else (b,a,c)
+    if z<y:
+        y=z if x<z else x
+    return y
+
+def partition3(num,lo,hi,pivot):
+    # Bentley-McIlroy 3-way partition of num[lo:hi] -> (<pivot)(==pivot)(>pivot)
+    # scans from both ends like Hoare's partition, so already ordered runs are not
+    # scrambled; equal keys are parked at the two ends and swapped into the middle
+    i,j=lo,hi-1
+    p,q=lo,hi
+    while i<=j:
+        x=num[i]
+        if x<pivot:
+            i+=1
+            continue
+        y=num[j]
+        if pivot<y:
+            j-=1
+            continue
+        if i==j:
+            num[p],num[i]=x,num[p]
+            p+=1
+            i+=1
+            break
+        num[i],num[j]=y,x
+        if not y<pivot:
+            num[p],num[i]=y,num[p]
+            p+=1
+        if not pivot<x:
+            q-=1
+            num[q],num[j]=x,num[q]
+        i+=1
+        j-=1
+    # num[lo:p]==pivot, num[p:i]<pivot, num[i:q]>pivot, num[q:hi]==pivot
+    for k in range(min(p-lo,i-p)):
+        num[lo+k],num[i-1-k]=num[i-1-k],num[lo+k]
+    for k in range(min(hi-q,q-i)):
+        num[i+k],num[hi-1-k]=num[hi-1-k],num[i+k]
+    return lo+(i-p),i+(hi-q)
+
+def introSort(num,lo=0,hi=None):
+    if hi is None:
+        hi=len(num)
+    stats=instrument.active()
+    stack=[(lo,hi,2*max(hi-lo,1).bit_length())]
+    while stack:
+        lo,hi,depth=stack.pop()
+        if stats is not None:
+            stats.depth(len(stack)+1)
+        while hi-lo>SMALL:
+            if depth==0:
+                if stats is not None:
+                    stats.fallbacks+=1
+                heapSort(num,lo,hi)
+                break
+            depth-=1
+            if hi-lo>NINTHER:
+                pivot=ninther(num,lo,hi)
+            else:
+                pivot=medianOfThree(num,lo,(lo+hi)//2,hi-1)
+            lt,gt=partition3(num,lo,hi,pivot)
+            # loop on the larger side, push the smaller one so the stack stays O(log n)
+            if lt-lo<hi-gt:
+                stack.append((lo,lt,depth))
+                lo=gt
+            else:
+                stack.append((gt,hi,depth))
+                hi=lt
+        else:
+            insertionSort(num,lo,hi)
+    return num
+
+# TC=O(n log n) worst case (heap sort fallback), SC=O(log n). Not stable.
+# Equal keys are grouped by the 3-way partition so few-unique inputs are fast.
+# Sorted, reversed and organ-pipe inputs get good pivots from the ninther and
+# never reach the heap sort fallback (the benchmark --check verifies this).
@@ -0,0 +1,96 @@
+# lazy k-way merge of already sorted inputs with a loser tree
+#
+# the tree keeps, for every internal node, the input that lost the match at that
+# node; the overall winner sits in tree[0]. After the winner yields an item only
+# the matches on its path to the root are replayed: log2(k) comparisons per item.
+#
+# every input is read through a buffer of at most `readahead` items, so memory
+# stays O(k * readahead) no matter how long the inputs are
+from itertools import islice
+
+class Source:
+    # one sorted input with a bounded read-ahead buffer
+    __slots__=("it","buf","pos","readahead","done","item","key")
+
+    def __init__(self,iterable,readahead):
+        self.it=iter(iterable)
+        self.buf=[]
+        self.pos=0
+        self.readahead=readahead
+        self.done=False
+
+    def advance(self,key):
+        if self.pos==len(self.buf):
+            self.buf=list(islice(self.it,self.readahead))
+            self.pos=0
+            if not self.buf:
+                self.done=True
+                self.item=self.key=None
+                return
+        self.item=self.buf[self.pos]
+        self.pos+=1
+        self.key=self.item if key is None else key(self.item)
+
+def beats(a,b,sources):
+    # does input a win against input b? ties go to the lower input number (stable)
+    sa,sb=sources[a],sources[b]
+    if sa.done:
+        return False
+    if sb.done:
+        return True
+    if sa.key<sb.key:
+        return True
+    if sb.key<sa.key:
+        return False
+    return a<b
+
+def kwayMerge(*iterables,key=None,unique=False,readahead=64):
+    # merges sorted iterables into one sorted stream
+    # unique=True drops items whose key equals the previous item's key
+    sources=[Source(it,readahead) for it in iterables]
+    k=len(sources)
+    if k==0:
+        return
+    for s in sources:
+        s.advance(key)
+    # winners[n] = winner of the subtree under node n, leaves are n=k..2k-1
+    winners=[0]*(2*k)
+    tree=[0]*k
+    for i in range(k):
+        winners[k+i]=i
+    for n in range(k-1,0,-1):
+        a,b=winners[2*n],winners[2*n+1]
+        if beats(a,b,sources):
+            winners[n],tree[n]=a,b
+        else:
+            winners[n],tree[n]=b,a
+    winner=winners[1] if k>1 else 0
+    hasLast=False
+    lastKey=None
+    while True:
+        s=sources[winner]
+        if s.done:
+            return
+        if not (unique and hasLast and s.key==lastKey):
+            yield s.item
+            hasLast=True
+            lastKey=s.key
+        s.advance(key)
+        # replay the matches from the winner's leaf up to the root
+        node=(winner+k)//2
+        while node:
+            if beats(tree[node],winner,sources):
+                tree[node],winner=winner,tree[node]
+            node//=2
+
+def readSortedFile(path):
+    # same as read_large_file in BasicToAdvance/17_Generator.py: one line at a time
+    with open(path) as f:
+        for line in f:
+            yield line
+
+def mergeFiles(paths,key=None,unique=False,readahead=1024):
+    # merge already sorted text files (e.g. hourly logs) line by line
+    return kwayMerge(*(readSortedFile(p) for p in paths),key=key,unique=unique,readahead=readahead)
+
+# TC=O(n log k) comparisons for n items from k inputs, SC=O(k * readahead)
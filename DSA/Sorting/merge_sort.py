@@ -0,0 +1,45 @@
+# bottom-up merge sort with one auxiliary buffer, stable
+from . import instrument
+from .insertion_sort import insertionSort
+
+BLOCK=32
+
+def merge(num,buf,lo,mid,hi):
+    # merge sorted num[lo:mid] and num[mid:hi], only the left half is copied out
+    if not num[mid]<num[mid-1]:
+        return
+    left=mid-lo
+    buf[:left]=num[lo:mid]
+    i,j,k=0,mid,lo
+    while i<left and j<hi:
+        if num[j]<buf[i]:
+            num[k]=num[j]
+            j+=1
+        else:
+            num[k]=buf[i]
+            i+=1
+        k+=1
+    # copied one by one: a slice assignment of the list buffer would fail for array('d') etc.
+    while i<left:
+        num[k]=buf[i]
+        i+=1
+        k+=1
+
+def mergeSort(num):
+    n=len(num)
+    with instrument.phase("blocks"):
+        for lo in range(0,n,BLOCK):
+            insertionSort(num,lo,min(lo+BLOCK,n))
+    buf=[None]*(n//2+1)
+    stats=instrument.active()
+    if stats is not None:
+        stats.allocated(len(buf))
+    width=BLOCK
+    with instrument.phase("merge"):
+        while width<n:
+            for lo in range(0,n-width,2*width):
+                merge(num,buf,lo,lo+width,min(lo+2*width,n))
+            width*=2
+    return num
+
+# TC=O(n log n) and SC=O(n/2) for the buffer. Stable.
@@ -0,0 +1,82 @@
+# parallel sample sort (PSRS: parallel sorting by regular sampling)
+#
+# the numbers live in two shared memory arrays (RawArray) that every worker
+# inherits when the pool starts, so only small tuples of offsets go through pickle
+#
+# 1. every worker sorts one contiguous slice of src and returns p regular samples
+# 2. the parent sorts the p*p samples and picks p-1 splitters, then bisects
+#    every sorted slice to find where each bucket starts inside it
+# 3. worker j merges bucket j out of all the slices and writes it into dst at
+#    its final position
+import bisect
+import multiprocessing
+import os
+from array import array
+from multiprocessing.sharedctypes import RawArray
+
+PARALLEL_THRESHOLD=100000
+
+src=None
+dst=None
+
+def initWorker(shared_src,shared_dst,typecode):
+    global src,dst
+    src=view(shared_src,typecode)
+    dst=view(shared_dst,typecode)
+
+def view(shared,typecode):
+    # ctypes exposes a '<q' style format, go through bytes to get a plain 'q' view
+    return memoryview(shared).cast("B").cast(typecode)
+
+def sortSlice(args):
+    lo,hi,parts=args
+    src[lo:hi]=array(src.format,sorted(src[lo:hi]))
+    n=hi-lo
+    return [src[lo+(i*n)//parts] for i in range(parts)] if n else []
+
+def mergeBucket(args):
+    segments,offset=args
+    values=[]
+    for lo,hi in segments:
+        values.extend(src[lo:hi])
+    # the segments are sorted runs, timsort merges them in O(m log k)
+    values.sort()
+    dst[offset:offset+len(values)]=array(dst.format,values)
+    return len(values)
+
+def parallelSort(data,processes=None,typecode="q"):
+    # sorts a list or array of numbers in place, typecode is the array typecode
+    # of the values ('q' for 64-bit ints, 'd' for floats)
+    n=len(data)
+    processes=processes or os.cpu_count() or 1
+    if processes==1 or n<PARALLEL_THRESHOLD:
+        data[:]=array(data.typecode,sorted(data)) if isinstance(data,array) else sorted(data)
+        return data
+    shared_src=RawArray(typecode,n)
+    shared_dst=RawArray(typecode,n)
+    view(shared_src,typecode)[:]=data if isinstance(data,array) and data.typecode==typecode else array(typecode,data)
+    slices=[((i*n)//processes,((i+1)*n)//processes) for i in range(processes)]
+    with multiprocessing.Pool(processes,initializer=initWorker,initargs=(shared_src,shared_dst,typecode)) as pool:
+        samples=pool.map(sortSlice,[(lo,hi,processes) for lo,hi in slices])
+        samples=sorted(x for s in samples for x in s)
+        splitters=[samples[i*len(samples)//processes] for i in range(1,processes)]
+        sortedSrc=view(shared_src,typecode)
+        # cuts[i] = bucket boundaries inside slice i
+        cuts=[]
+        for lo,hi in slices:
+            cuts.append([lo]+[bisect.bisect_right(sortedSrc,s,lo,hi) for s in splitters]+[hi])
+        tasks=[]
+        offset=0
+        for j in range(processes):
+            segments=[(c[j],c[j+1]) for c in cuts]
+            tasks.append((segments,offset))
+            offset+=sum(hi-lo for lo,hi in segments)
+        pool.map(mergeBucket,tasks)
+    result=view(shared_dst,typecode)
+    if isinstance(data,array) and data.typecode==typecode:
+        view(data,typecode)[:]=result
+    else:
+        data[:]=result.tolist()
+    return data
+
+# TC=O((n/p) log n) per worker + O(p^2 log n) for the splitters, SC=O(n) shared memory
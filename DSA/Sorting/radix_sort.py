@@ -0,0 +1,131 @@
+# non-comparison sorts for integers, fixed width byte records and strings
+# they only beat comparison sorts when the keys are narrow, see engine.chooseAlgorithm
+from array import array
+
+from . import instrument
+from .insertion_sort import insertionSort
+
+RADIX_BITS=8
+MSD_SMALL=32
+
+def writeBack(num,values):
+    # replace the contents of a list / array in place
+    if isinstance(num,array):
+        num[:]=array(num.typecode,values)
+    else:
+        num[:]=values
+
+def integerRange(num):
+    # (min, max) if every item is an int, else None
+    if isinstance(num,array):
+        if num.typecode not in "bBhHiIlLqQ" or not num:
+            return None
+        return min(num),max(num)
+    if not num or not all(type(x) is int for x in num):
+        return None
+    return min(num),max(num)
+
+def countingSort(num):
+    keys=integerRange(num)
+    if keys is None:
+        if len(num)==0:
+            return num
+        raise TypeError("countingSort needs integer items")
+    low,high=keys
+    counts=[0]*(high-low+1)
+    stats=instrument.active()
+    if stats is not None:
+        stats.allocated(len(counts))
+    for x in num:
+        counts[x-low]+=1
+    result=[]
+    for offset,c in enumerate(counts):
+        if c:
+            result.extend([low+offset]*c)
+    writeBack(num,result)
+    return num
+
+def lsdRadixSort(num):
+    # least significant digit first, RADIX_BITS per pass; values are shifted by
+    # the minimum so negative numbers work and the pass count follows the range
+    keys=integerRange(num)
+    if keys is None:
+        if len(num)==0:
+            return num
+        raise TypeError("lsdRadixSort needs integer items")
+    low,high=keys
+    mask=(1<<RADIX_BITS)-1
+    values=list(num)
+    stats=instrument.active()
+    shift=0
+    span=high-low
+    while span>>shift:
+        buckets=[[] for _ in range(mask+1)]
+        if stats is not None:
+            stats.allocated(len(values))
+        for x in values:
+            buckets[((x-low)>>shift)&mask].append(x)
+        values=[x for b in buckets for x in b]
+        shift+=RADIX_BITS
+    writeBack(num,values)
+    return num
+
+def radixSortRecords(buf,width):
+    # sorts a buffer of fixed width byte records (e.g. 16-byte keys back to back)
+    # bytearray / writable memoryview are sorted in place, bytes gives a new bytearray
+    n=len(buf)
+    if n%width:
+        raise ValueError(f"buffer length {n} is not a multiple of {width}")
+    view=memoryview(buf).cast("B")
+    records=[bytes(view[i:i+width]) for i in range(0,n,width)]
+    for pos in range(width-1,-1,-1):
+        buckets=[[] for _ in range(256)]
+        for r in records:
+            buckets[r[pos]].append(r)
+        records=[r for b in buckets for r in b]
+    out=b"".join(records)
+    if view.readonly:
+        return bytearray(out)
+    view[:]=out
+    return buf
+
+def msdRadixSort(num):
+    # most significant character first, for lists of str or bytes of any length
+    # shorter strings come before longer ones with the same prefix
+    values=list(num)
+    stats=instrument.active()
+    stack=[(0,len(values),0)]
+    while stack:
+        lo,hi,depth=stack.pop()
+        if stats is not None:
+            stats.depth(depth+1)
+        if hi-lo<=MSD_SMALL:
+            # nothing before depth differs, so a plain comparison sort is fine here
+            insertionSort(values,lo,hi)
+            continue
+        done=[]
+        buckets={}
+        for s in values[lo:hi]:
+            if len(s)<=depth:
+                done.append(s)
+            else:
+                c=s[depth]
+                if c in buckets:
+                    buckets[c].append(s)
+                else:
+                    buckets[c]=[s]
+        values[lo:lo+len(done)]=done
+        pos=lo+len(done)
+        for c in sorted(buckets):
+            b=buckets[c]
+            values[pos:pos+len(b)]=b
+            if len(b)>1:
+                stack.append((pos,pos+len(b),depth+1))
+            pos+=len(b)
+    writeBack(num,values)
+    return num
+
+# countingSort: TC=O(n+k) SC=O(k), k = max-min+1
+# lsdRadixSort: TC=O(n*w/8) for w-bit range, SC=O(n)
+# radixSortRecords: TC=O(n*width), SC=O(n)
+# msdRadixSort: TC=O(total characters examined), SC=O(n)
@@ -0,0 +1,96 @@
+# top-k queries without sorting everything
+# select_k -> k-th smallest with introselect (quickselect + median of medians fallback)
+# nsmallest / nlargest -> one pass with a heap that never holds more than k items
+import heapq
+from itertools import islice
+
+from .heap_sort import siftDown
+from .insertion_sort import insertionSort
+from .intro_sort import SMALL, medianOfThree, partition3
+
+def medianOfMedians(num,lo,hi):
+    # median of the medians of groups of 5, guarantees a 30/70 split
+    m=lo
+    for start in range(lo,hi,5):
+        end=min(start+5,hi)
+        insertionSort(num,start,end)
+        mid=(start+end-1)//2
+        num[m],num[mid]=num[mid],num[m]
+        m+=1
+    return introSelect(num,(lo+m-1)//2,lo,m)
+
+def introSelect(num,k,lo=0,hi=None):
+    # rearranges num[lo:hi] so that num[k] is the element that would be there
+    # after sorting, smaller elements before it and bigger ones after it
+    if hi is None:
+        hi=len(num)
+    badSplits=0
+    while hi-lo>SMALL:
+        size=hi-lo
+        if badSplits<2:
+            pivot=medianOfThree(num,lo,(lo+hi)//2,hi-1)
+        else:
+            pivot=medianOfMedians(num,lo,hi)
+        lt,gt=partition3(num,lo,hi,pivot)
+        if k<lt:
+            hi=lt
+        elif k>=gt:
+            lo=gt
+        else:
+            return num[k]
+        # quickselect is only O(n) if the range keeps shrinking
+        if hi-lo>3*size//4:
+            badSplits+=1
+    insertionSort(num,lo,hi)
+    return num[k]
+
+def select_k(data,k):
+    # k-th smallest item of the list data (k starts at 0), data is partially reordered
+    if not 0<=k<len(data):
+        raise IndexError("k out of range")
+    return introSelect(data,k)
+
+def nsmallest(iterable,k,key=None):
+    # the k smallest items in ascending order, ties keep input order
+    if k<=0:
+        return []
+    it=iter(iterable)
+    if key is None:
+        key=lambda x:x
+    # max heap of (key, order, item) built from the first k items
+    heap=[(key(x),i,x) for i,x in enumerate(islice(it,k))]
+    size=len(heap)
+    for root in range(size//2-1,-1,-1):
+        siftDown(heap,0,root,size)
+    order=size
+    for x in it:
+        kx=key(x)
+        # a new item only gets in if it beats the current worst one
+        if kx<heap[0][0]:
+            heap[0]=(kx,order,x)
+            siftDown(heap,0,0,size)
+        order+=1
+    heap.sort()
+    return [x for _,_,x in heap]
+
+def nlargest(iterable,k,key=None):
+    # the k largest items in descending order, ties keep input order
+    if k<=0:
+        return []
+    it=iter(iterable)
+    if key is None:
+        key=lambda x:x
+    # min heap of (key, -order, item), the oldest tie wins
+    heap=[(key(x),-i,x) for i,x in enumerate(islice(it,k))]
+    heapq.heapify(heap)
+    order=len(heap)
+    for x in it:
+        kx=key(x)
+        if heap[0][0]<kx:
+            heapq.heapreplace(heap,(kx,-order,x))
+        order+=1
+    heap.sort(reverse=True)
+    return [x for _,_,x in heap]
+
+# select_k: TC=O(n) worst case, SC=O(log n)
+# nsmallest / nlargest: TC=O(n log k), SC=O(k)
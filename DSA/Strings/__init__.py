@@ -0,0 +1,3 @@
+from .palindrome import PalindromeIndex, countPalindromes, longestPalindrome, manacher
+from .palindrome_hash import PalindromeHashIndex
+from .palindrome_file import isPalindromeFile
@@ -0,0 +1,76 @@
+# palindromes in O(n) with Manacher's algorithm (no recursion, unlike
+# PalindronString in BasicToAdvance/6_PalindromString.py)
+#
+# odd[i]  = number of odd palindromes centred at i       (s[i-k+1 : i+k] for k <= odd[i])
+# even[i] = number of even palindromes centred between i-1 and i (s[i-k : i+k] for k <= even[i])
+#
+# every palindrome found inside the rightmost one seen so far ([l, r)) gives a lower
+# bound through its mirror position, so the inner while loops only ever push r right
+from array import array
+
+def manacher(s):
+    # returns (odd, even) radius arrays for the string / bytes s
+    n=len(s)
+    odd=array("i",bytes(4*n))
+    l,r=0,0
+    for i in range(n):
+        k=1 if i>=r else min(odd[l+r-1-i],r-i)
+        while i-k>=0 and i+k<n and s[i-k]==s[i+k]:
+            k+=1
+        odd[i]=k
+        if i+k>r:
+            l,r=i-k+1,i+k
+    even=array("i",bytes(4*n))
+    l,r=0,0
+    for i in range(n):
+        k=0 if i>=r else min(even[l+r-i],r-i)
+        while i-k-1>=0 and i+k<n and s[i-k-1]==s[i+k]:
+            k+=1
+        even[i]=k
+        if i+k>r:
+            l,r=i-k,i+k
+    return odd,even
+
+def longestPalindrome(s):
+    # the longest palindromic substring (the leftmost one if there are several)
+    if not s:
+        return s[:0]
+    odd,even=manacher(s)
+    bestStart,bestLen=0,1
+    for i in range(len(s)):
+        length=2*odd[i]-1
+        if length>bestLen or (length==bestLen and i-odd[i]+1<bestStart):
+            bestStart,bestLen=i-odd[i]+1,length
+        length=2*even[i]
+        if length>bestLen or (length==bestLen and i-even[i]<bestStart):
+            bestStart,bestLen=i-even[i],length
+    return s[bestStart:bestStart+bestLen]
+
+def countPalindromes(s):
+    # number of (start, end) pairs where s[start:end] is a non-empty palindrome
+    odd,even=manacher(s)
+    return sum(odd)+sum(even)
+
+class PalindromeIndex:
+    # answers "is s[i:j] a palindrome?" in O(1) after an O(n) build
+    def __init__(self,s):
+        self.n=len(s)
+        self.odd,self.even=manacher(s)
+
+    def isPalindrome(self,i,j):
+        # i, j as in slicing: s[i:j], empty ranges count as palindromes
+        if not 0<=i<=j<=self.n:
+            raise IndexError("range out of bounds")
+        length=j-i
+        if length<=1:
+            return True
+        if length&1:
+            return self.odd[(i+j)//2]>=(length+1)//2
+        return self.even[(i+j)//2]>=length//2
+
+    def isPalindromeBatch(self,lefts,rights):
+        # one answer per (lefts[k], rights[k]) pair, as a bytearray of 0 / 1
+        query=self.isPalindrome
+        return bytearray(query(i,j) for i,j in zip(lefts,rights))
+
+# TC=O(n) build, O(1) per query. SC=O(n) (two int32 arrays)
@@ -0,0 +1,63 @@
+# palindrome check for files of any size: the file is memory-mapped and read
+# one chunk at a time from both ends toward the middle, so the extra memory is
+# a few chunks no matter how big the file is
+#
+# the check works on bytes: ignore_case folds ASCII letters, alnum_only drops
+# every byte that is not an ASCII letter or digit (e.g. newlines in sequence files)
+import mmap
+import os
+
+CHUNK=1<<20
+ALNUM=b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+NOT_ALNUM=bytes(b for b in range(256) if b not in ALNUM)
+
+def isPalindromeFile(path,ignore_case=False,alnum_only=False,chunk_size=CHUNK):
+    if os.path.getsize(path)==0:
+        return True
+    with open(path,"rb") as f, mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ) as mm:
+        if not ignore_case and not alnum_only:
+            return compareRaw(mm,chunk_size)
+        return compareNormalized(mm,chunk_size,ignore_case,alnum_only)
+
+def compareRaw(mm,chunk_size):
+    i,j=0,len(mm)
+    while j-i>1:
+        c=min(chunk_size,(j-i)//2)
+        if mm[i:i+c]!=mm[j-c:j][::-1]:
+            return False
+        i+=c
+        j-=c
+    return True
+
+def compareNormalized(mm,chunk_size,ignore_case,alnum_only):
+    def normalize(raw):
+        if alnum_only:
+            raw=raw.translate(None,NOT_ALNUM)
+        if ignore_case:
+            raw=raw.lower()
+        return raw
+
+    # raw bytes [i, j) are still unread; front holds normalized bytes read from
+    # the left, back holds normalized bytes read from the right (already reversed)
+    i,j=0,len(mm)
+    front=back=b""
+    while True:
+        k=min(len(front),len(back))
+        if front[:k]!=back[:k]:
+            return False
+        front=front[k:]
+        back=back[k:]
+        if i==j:
+            # everything is read: what is left over is the middle of the text
+            middle=front+back[::-1]
+            return middle==middle[::-1]
+        if not front:
+            c=min(chunk_size,j-i)
+            front=normalize(mm[i:i+c])
+            i+=c
+        if not back and i<j:
+            c=min(chunk_size,j-i)
+            back=normalize(mm[j-c:j])[::-1]
+            j-=c
+
+# TC=O(n) bytes read once, SC=O(chunk_size)
@@ -0,0 +1,57 @@
+# O(1) "is text[i:j] a palindrome?" with polynomial rolling hashes
+#
+# forward[k] = hash of text[:k], backward[k] = hash of the reversed text[:k];
+# text[i:j] is a palindrome when its forward hash equals the hash of the same
+# range read backwards. Two moduli with a random base make a false match
+# about 1 in 10^18 per query.
+import random
+from array import array
+
+MODS=(1000000007,998244353)
+
+def prefixHashes(codes,base,mod):
+    h=array("q",bytes(8*(len(codes)+1)))
+    value=0
+    for k,c in enumerate(codes,1):
+        value=(value*base+c)%mod
+        h[k]=value
+    return h
+
+def powers(n,base,mod):
+    p=array("q",bytes(8*(n+1)))
+    value=1
+    for k in range(n+1):
+        p[k]=value
+        value=value*base%mod
+    return p
+
+class PalindromeHashIndex:
+    def __init__(self,text,seed=None):
+        codes=list(map(ord,text)) if isinstance(text,str) else list(text)
+        rng=random.Random(seed)
+        self.n=len(codes)
+        self.tables=[]
+        for mod in MODS:
+            base=rng.randrange(256,mod-1)
+            self.tables.append((mod,prefixHashes(codes,base,mod),prefixHashes(codes[::-1],base,mod),powers(self.n,base,mod)))
+
+    def isPalindrome(self,i,j):
+        # i, j as in slicing: text[i:j], empty ranges count as palindromes
+        n=self.n
+        if not 0<=i<=j<=n:
+            raise IndexError("range out of bounds")
+        length=j-i
+        for mod,forward,backward,pw in self.tables:
+            # text[i:j] read backwards is reversed_text[n-j:n-i]
+            a=(forward[j]-forward[i]*pw[length])%mod
+            b=(backward[n-i]-backward[n-j]*pw[length])%mod
+            if a!=b:
+                return False
+        return True
+
+    def isPalindromeBatch(self,lefts,rights):
+        # one answer per (lefts[k], rights[k]) pair, as a bytearray of 0 / 1
+        query=self.isPalindrome
+        return bytearray(query(i,j) for i,j in zip(lefts,rights))
+
+# TC=O(n) build, O(1) per query. SC=O(n): six int64 arrays of n+1 entries